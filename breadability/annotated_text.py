@@ -3,8 +3,10 @@
 from __future__ import absolute_import
 from __future__ import division, print_function, unicode_literals
 
+from array import array
 from itertools import groupby
-from lxml.sax import saxify, ContentHandler
+from lxml.etree import iterwalk
+from lxml.sax import ContentHandler
 from .utils import is_blank, shrink_text
 from ._compat import to_unicode
 
@@ -15,43 +17,165 @@ _SEMANTIC_TAGS = frozenset((
     "h5", "h6", "i", "ins", "kbd", "li", "marquee", "menu", "ol", "pre", "q",
     "s", "samp", "strike", "strong", "sub", "sup", "tt", "u", "ul", "var",
 ))
+_PARAGRAPH_TAGS = frozenset(("p", "ol", "ul", "pre"))
+_BLOCK_TAGS = _PARAGRAPH_TAGS.union((
+    "blockquote", "br", "dd", "div", "dt", "h1", "h2", "h3", "h4", "h5",
+    "h6", "li", "td", "th", "tr",
+))
+_WALK_EVENTS = ("start", "end", "comment", "pi")
+
+
+def extract_text(dom):
+    """
+    Converts DOM into plain text. Paragraphs are separated by
+    an empty line.
+    """
+    return "\n\n".join(iter_text_paragraphs(dom))
+
+
+def iter_text_paragraphs(dom):
+    """
+    Yields plain text of paragraphs in the DOM. Paragraphs are split
+    the same way as by `AnnotatedTextHandler` and their whitespace is
+    normalized by `shrink_text`. The DOM is walked directly so it isn't
+    copied nor serialized. Lines of lists, headings, etc. inside
+    a paragraph are kept on separate lines.
+    """
+    chunks = []
+
+    for event, node in iterwalk(dom, events=_WALK_EVENTS):
+        if event == "start":
+            if node.tag in _BLOCK_TAGS and chunks:
+                chunks.append("\n")
+            text = node.text
+            if text:
+                chunks.append(text)
+            continue
+
+        if event == "end":
+            if node.tag in _PARAGRAPH_TAGS:
+                text = shrink_text("".join(chunks))
+                if text:
+                    yield text
+                chunks = []
+            elif node.tag in _BLOCK_TAGS:
+                chunks.append("\n")
+
+        # tail of the walked subtree is not its content
+        tail = node.tail
+        if tail and node is not dom:
+            chunks.append(tail)
+
+    text = shrink_text("".join(chunks))
+    if text:
+        yield text
 
 
 class AnnotatedTextHandler(ContentHandler):
-    """A class for converting a HTML DOM into annotated text."""
+    """
+    A class for converting a HTML DOM into annotated text.
+
+    The DOM is walked directly by `parse` but the handler still works
+    as a SAX content handler, e.g. with `lxml.sax.saxify`.
+    """
 
     @classmethod
     def parse(cls, dom):
         """Converts DOM into paragraphs."""
-        handler = cls()
-        saxify(dom, handler)
-        return handler.content
+        return list(cls.iter_paragraphs(dom))
+
+    @classmethod
+    def iter_paragraphs(cls, dom):
+        """
+        Converts DOM into paragraphs lazily. Every paragraph is yielded
+        as soon as it's complete so consumers can process it while
+        the rest of the DOM is converted.
+        """
+        return cls().walk(dom)
 
     def __init__(self):
         self._content = []
         self._paragraph = []
         self._dom_path = []
+        # annotation for every prefix of the DOM path, the tuples are
+        # interned by the parent annotation and the appended tag
+        self._annotations = [None]
+        self._interned_annotations = {}
 
     @property
     def content(self):
         return self._content
 
+    def walk(self, dom):
+        """
+        Feeds the handler by elements of the DOM without copying it and
+        yields paragraphs as soon as they're complete. Yielded paragraphs
+        are not kept in `content`. The tail of the DOM element itself
+        is not its content.
+        """
+        for event, node in iterwalk(dom, events=_WALK_EVENTS):
+            if event == "start":
+                self._start_element(node.tag)
+                text = node.text
+                if text:
+                    self.characters(text)
+                continue
+
+            if event == "end":
+                self._end_element(node.tag)
+                if self._content:
+                    for paragraph in self._take_content():
+                        yield paragraph
+
+            tail = node.tail
+            if tail and node is not dom:
+                self.characters(tail)
+
+        self.endDocument()
+        for paragraph in self._take_content():
+            yield paragraph
+
+    def _take_content(self):
+        content = self._content
+        self._content = []
+        return content
+
     def startElementNS(self, name, qname, attrs):
         namespace, name = name
-
-        if name in _SEMANTIC_TAGS:
-            self._dom_path.append(to_unicode(name))
+        self._start_element(name)
 
     def endElementNS(self, name, qname):
         namespace, name = name
+        self._end_element(name)
 
+    def _start_element(self, name):
+        if name in _SEMANTIC_TAGS:
+            self._push_annotation(to_unicode(name))
+
+    def _end_element(self, name):
         if name == "p" and self._paragraph:
             self._append_paragraph(self._paragraph)
         elif name in ("ol", "ul", "pre") and self._paragraph:
             self._append_paragraph(self._paragraph)
-            self._dom_path.pop()
+            self._pop_annotation()
         elif name in _SEMANTIC_TAGS:
-            self._dom_path.pop()
+            self._pop_annotation()
+
+    def _push_annotation(self, name):
+        parent = self._annotations[-1]
+        key = (parent, name)
+
+        annotation = self._interned_annotations.get(key)
+        if annotation is None:
+            annotation = tuple(sorted(frozenset(parent or ()) | set([name])))
+            self._interned_annotations[key] = annotation
+
+        self._dom_path.append(name)
+        self._annotations.append(annotation)
+
+    def _pop_annotation(self):
+        self._dom_path.pop()
+        self._annotations.pop()
 
     def endDocument(self):
         if self._paragraph:
@@ -81,9 +205,104 @@ class AnnotatedTextHandler(ContentHandler):
         if is_blank(content):
             return
 
-        if self._dom_path:
-            pair = (content, tuple(sorted(frozenset(self._dom_path))))
-        else:
-            pair = (content, None)
+        self._paragraph.append((content, self._annotations[-1]))
+
+
+# typecode has to be native string in both Python 2 and 3
+_OFFSETS_TYPECODE = str("I")
+
+
+class CompactAnnotatedText(object):
+    """
+    Compact form of annotated text suitable for keeping in memory and
+    for transfer between processes. The whole text is stored in one
+    string and its annotated parts are stored as spans in flat arrays.
+
+    :ivar text: Text of all paragraphs. Parts of a paragraph are
+        separated by a space and paragraphs by an empty line.
+    :ivar spans: Array of triples ``start, end, annotation_id`` where
+        ``annotation_id`` is index into `annotations`.
+    :ivar paragraphs: Array of indexes of the first span after every
+        paragraph, so spans of paragraph ``i`` are between
+        ``paragraphs[i - 1]`` and ``paragraphs[i]``.
+    :ivar annotations: Tuple of all annotations with ``None`` first.
+    """
+    __slots__ = ("text", "spans", "paragraphs", "annotations")
+
+    def __init__(self, text, spans, paragraphs, annotations):
+        self.text = text
+        self.spans = spans
+        self.paragraphs = paragraphs
+        self.annotations = annotations
+
+    @classmethod
+    def from_content(cls, content):
+        """
+        Converts content of `AnnotatedTextHandler` (iterable of
+        paragraphs with pairs ``(text, annotation)``).
+        """
+        parts = []
+        offset = 0
+        spans = array(_OFFSETS_TYPECODE)
+        paragraphs = array(_OFFSETS_TYPECODE)
+        annotations = [None]
+        annotation_ids = {None: 0}
+
+        for paragraph in content:
+            separator = "\n\n" if parts else ""
+            for text, annotation in paragraph:
+                parts.append(separator)
+                offset += len(separator)
+                separator = " "
+
+                annotation_id = annotation_ids.get(annotation)
+                if annotation_id is None:
+                    annotation_id = len(annotations)
+                    annotation_ids[annotation] = annotation_id
+                    annotations.append(annotation)
+
+                parts.append(text)
+                spans.extend((offset, offset + len(text), annotation_id))
+                offset += len(text)
+
+            paragraphs.append(len(spans) // 3)
+
+        return cls("".join(parts), spans, paragraphs, tuple(annotations))
+
+    def to_content(self):
+        """Converts the text into the content of `AnnotatedTextHandler`."""
+        content = []
+        text, spans, annotations = self.text, self.spans, self.annotations
+
+        first_span = 0
+        for last_span in self.paragraphs:
+            content.append(tuple(
+                (text[spans[i]:spans[i + 1]], annotations[spans[i + 2]])
+                for i in range(first_span * 3, last_span * 3, 3)
+            ))
+            first_span = last_span
+
+        return content
+
+    def __reduce__(self):
+        return (self.__class__, (
+            self.text, self.spans, self.paragraphs, self.annotations))
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactAnnotatedText):
+            return NotImplemented
+
+        return (
+            self.text == other.text and
+            self.spans == other.spans and
+            self.paragraphs == other.paragraphs and
+            self.annotations == other.annotations
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
-        self._paragraph.append(pair)
+    def __repr__(self):
+        return "<CompactAnnotatedText with %d paragraphs>" % len(
+            self.paragraphs)
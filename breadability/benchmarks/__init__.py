@@ -0,0 +1,6 @@
+# -*- coding: utf8 -*-
+
+"""Performance measurements of breadability."""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
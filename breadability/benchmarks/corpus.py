@@ -0,0 +1,214 @@
+# -*- coding: utf8 -*-
+
+"""Benchmarks over the corpus of test articles."""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import gc
+import platform
+
+from collections import Counter
+from functools import partial
+from glob import glob
+from math import ceil
+from os.path import basename, dirname, join, pardir
+from timeit import default_timer
+
+from .. import __version__
+from ..readable import Article
+
+
+TEST_ARTICLES_PATH = join(
+    dirname(__file__),
+    pardir, pardir,
+    "tests", "test_articles"
+)
+
+
+def load_corpus(path=None):
+    """
+    Loads HTML of articles stored as ``<path>/<name>/article.html``.
+
+    :returns list: Pairs ``(name, html)`` sorted by the name.
+    """
+    pattern = join(path or TEST_ARTICLES_PATH, "*", "article.html")
+
+    documents = []
+    for file_path in sorted(glob(pattern)):
+        with open(file_path, "rb") as file:
+            documents.append((basename(dirname(file_path)), file.read()))
+
+    return documents
+
+
+def measure(function, repeat):
+    """
+    Calls the function repeatedly.
+
+    :returns tuple: The best time of all calls and the last result.
+    """
+    best_time = None
+    for _ in range(repeat):
+        start = default_timer()
+        result = function()
+        elapsed = default_timer() - start
+
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+
+    return best_time, result
+
+
+def percentile(values, fraction):
+    """
+    Returns the percentile of the values by the nearest rank method.
+
+    :param float fraction: Percentile as a fraction, e.g. 0.95.
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = max(int(ceil(fraction * len(values))), 1)
+    return values[rank - 1]
+
+
+def _get_readable(html):
+    return Article(html).readable
+
+
+def _get_main_text(html):
+    return Article(html).main_text
+
+
+def _get_title(html):
+    return Article(html).title
+
+
+OPERATIONS = (
+    ("readable", _get_readable),
+    ("main_text", _get_main_text),
+    ("title", _get_title),
+)
+
+
+def summarize_latencies(latencies, documents_bytes):
+    """
+    Computes throughput and latency percentiles of the runs over
+    the corpus.
+
+    :param list latencies: Times in seconds of every processed document.
+    :param int documents_bytes: Total length of the processed documents.
+    """
+    total_time = sum(latencies)
+    return {
+        "documents": len(latencies),
+        "total_time": total_time,
+        "docs_per_sec": len(latencies) / total_time if total_time else None,
+        "bytes_per_sec": documents_bytes / total_time if total_time else None,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+def _run_corpus(function, documents):
+    latencies = []
+    gc.collect()
+    for _, html in documents:
+        start = default_timer()
+        function(html)
+        latencies.append(default_timer() - start)
+
+    return latencies
+
+
+def benchmark_corpus(documents, operations=None, repeat=3):
+    """
+    Measures throughput and latency of the operations over the corpus.
+    The first run of every operation is reported as "cold", it includes
+    the first use of parsers, compiled patterns, etc. in the process
+    (only the first operation is really cold). The following runs are
+    reported together as "warm". Garbage is collected before every run.
+
+    :param operations: Names of operations from `OPERATIONS`, all by
+        default.
+    :param int repeat: Number of warm runs over the whole corpus.
+    :returns dict: JSON serializable results.
+    """
+    names = [name for name, _ in OPERATIONS]
+    functions = dict(OPERATIONS)
+    corpus_bytes = sum(len(html) for _, html in documents)
+
+    results = {}
+    for name in operations or names:
+        if name not in functions:
+            raise ValueError("Unknown operation %r." % name)
+
+        cold = _run_corpus(functions[name], documents)
+        warm = []
+        for _ in range(repeat):
+            warm.extend(_run_corpus(functions[name], documents))
+
+        results[name] = {
+            "cold": summarize_latencies(cold, corpus_bytes),
+            "warm": summarize_latencies(warm, corpus_bytes * repeat),
+        }
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "documents": len(documents),
+        "bytes": corpus_bytes,
+        "repeat": repeat,
+        "operations": results,
+    }
+
+
+def words_overlap(reference, text):
+    """
+    Compares words of the text against the reference text.
+
+    :returns tuple: Precision and recall of the words in the text.
+    """
+    expected = Counter(reference.split())
+    found = Counter(text.split())
+    common = sum((expected & found).values())
+
+    precision = common / sum(found.values()) if found else 1.0
+    recall = common / sum(expected.values()) if expected else 1.0
+    return precision, recall
+
+
+def _extract_text(html, lite):
+    return Article(html, lite=lite).readable_dom.text_content()
+
+
+def compare_lite(documents, repeat=3):
+    """
+    Measures speed and quality of the lite mode against the full one.
+    Quality is measured as overlap of words extracted in the lite mode
+    with words extracted in the full mode.
+
+    :returns list: Dictionary of results for every document.
+    """
+    results = []
+    for name, html in documents:
+        full_time, full_text = measure(
+            partial(_extract_text, html, False), repeat)
+        lite_time, lite_text = measure(
+            partial(_extract_text, html, True), repeat)
+        precision, recall = words_overlap(full_text, lite_text)
+
+        results.append({
+            "name": name,
+            "bytes": len(html),
+            "full_time": full_time,
+            "lite_time": lite_time,
+            "speedup": full_time / lite_time if lite_time else None,
+            "precision": precision,
+            "recall": recall,
+        })
+
+    return results
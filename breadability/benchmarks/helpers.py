@@ -0,0 +1,166 @@
+# -*- coding: utf8 -*-
+
+"""
+Microbenchmarks of the hot helpers. Every helper is measured in isolation
+on realistic samples collected from the corpus, e.g. all elements of the
+cleaned documents or texts of the scored paragraphs.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import gc
+
+from copy import deepcopy
+from timeit import default_timer
+
+from .._compat import string_types
+from ..document import (
+    build_document,
+    convert_break_elements_to_paragraphs,
+    convert_breaks_to_paragraphs,
+    decode_html,
+)
+from ..readable import Article, clean_conditionally
+from ..scoring import (
+    get_class_weight,
+    get_link_density,
+    is_unlikely_node,
+    score_candidates,
+)
+from ..utils import normalize_whitespace, shrink_text
+
+
+class Samples(object):
+    """
+    Inputs of the helpers collected from the corpus.
+
+    :ivar pages: Raw (bytes) HTML of the documents.
+    :ivar texts: Decoded HTML of the documents.
+    :ivar documents: Parsed documents before any processing.
+    :ivar nodes: All elements of the documents cleaned for scoring.
+    :ivar scorable_nodes: Lists of nodes scored in every document.
+    :ivar node_texts: Text content of the scorable nodes.
+    """
+
+    def __init__(self, documents):
+        self.pages = [html for _, html in documents]
+        self.texts = [decode_html(html) for html in self.pages]
+        self.documents = [build_document(text) for text in self.texts]
+        self.nodes = []
+        self.scorable_nodes = []
+
+        for text in self.texts:
+            dom = Article(text).dom
+            if dom is None:
+                continue
+
+            nodes = [
+                n for n in dom.iter() if isinstance(n.tag, string_types)]
+            self.nodes.extend(nodes)
+            self.scorable_nodes.append(
+                [n for n in nodes if n.tag in ("p", "td", "pre")])
+
+        self.node_texts = [
+            n.text_content()
+            for nodes in self.scorable_nodes for n in nodes
+        ]
+
+
+def _each(function, inputs):
+    for item in inputs:
+        function(item)
+
+    return len(inputs)
+
+
+def _copy_documents(samples):
+    return [deepcopy(document) for document in samples.documents]
+
+
+def _convert_break_elements(documents):
+    return _each(convert_break_elements_to_paragraphs, documents)
+
+
+def _score_candidates(samples):
+    for nodes in samples.scorable_nodes:
+        score_candidates(nodes)
+
+    return sum(len(nodes) for nodes in samples.scorable_nodes)
+
+
+MICROBENCHMARKS = (
+    # name, setup returning the input, function returning count of calls
+    ("get_link_density", None,
+        lambda samples: _each(get_link_density, samples.nodes)),
+    ("get_class_weight", None,
+        lambda samples: _each(get_class_weight, samples.nodes)),
+    ("is_unlikely_node", None,
+        lambda samples: _each(is_unlikely_node, samples.nodes)),
+    ("score_candidates", None, _score_candidates),
+    ("clean_conditionally", None,
+        lambda samples: _each(clean_conditionally, samples.nodes)),
+    ("normalize_whitespace", None,
+        lambda samples: _each(normalize_whitespace, samples.node_texts)),
+    ("shrink_text", None,
+        lambda samples: _each(shrink_text, samples.node_texts)),
+    ("decode_html", None,
+        lambda samples: _each(decode_html, samples.pages)),
+    ("convert_breaks_to_paragraphs", None,
+        lambda samples: _each(convert_breaks_to_paragraphs, samples.texts)),
+    ("convert_break_elements_to_paragraphs", _copy_documents,
+        _convert_break_elements),
+)
+
+
+def measure_helper(samples, setup, function, repeat):
+    """
+    Runs the function repeatedly with the input prepared by the setup
+    which is not measured. The samples are used directly if there is
+    no setup.
+
+    :returns tuple: The best time of all runs and count of the calls
+        of the helper in a single run.
+    """
+    best_time = None
+    for _ in range(repeat):
+        data = samples if setup is None else setup(samples)
+        gc.collect()
+
+        start = default_timer()
+        calls = function(data)
+        elapsed = default_timer() - start
+
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+
+    return best_time, calls
+
+
+def benchmark_helpers(documents, names=None, repeat=5):
+    """
+    Measures the helpers from `MICROBENCHMARKS` over samples of the
+    documents.
+
+    :param names: Names of the measured helpers, all by default.
+    :returns list: Dictionary of results for every helper.
+    """
+    benchmarks = dict((name, (s, f)) for name, s, f in MICROBENCHMARKS)
+    names = names or [name for name, _, _ in MICROBENCHMARKS]
+    for name in names:
+        if name not in benchmarks:
+            raise ValueError("Unknown helper %r." % name)
+
+    samples = Samples(documents)
+    results = []
+    for name in names:
+        setup, function = benchmarks[name]
+        total_time, calls = measure_helper(samples, setup, function, repeat)
+        results.append({
+            "name": name,
+            "calls": calls,
+            "total_time": total_time,
+            "time_per_call": total_time / calls if calls else None,
+        })
+
+    return results
@@ -0,0 +1,107 @@
+# -*- coding: utf8 -*-
+
+"""
+Memory used by the stages of the extraction. Allocations of Python
+objects are traced by `tracemalloc`, but the lxml trees are allocated
+by libxml2 outside of Python so they show up only in the growth of the
+resident set size (RSS) of the process.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import gc
+import os
+import platform
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc
+    tracemalloc = None
+
+from .. import __version__
+from .stages import run_stages
+
+
+def get_rss():
+    """
+    Returns the current resident set size of the process in bytes
+    or ``None`` if it's not known on this platform.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except (IOError, OSError, IndexError, ValueError):
+        return None
+
+    return pages * os.sysconf(str("SC_PAGE_SIZE"))
+
+
+def get_peak_rss():
+    """Returns the peak resident set size of the process in bytes."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def measure_memory(html):
+    """
+    Extracts the article and measures memory of every stage. The
+    results of the stages are kept until the extraction is done.
+
+    :returns dict: Mapping of stages to dictionaries with the peak size
+        of traced allocations ("peak"), allocations still alive after
+        the stage ("retained") and growth of RSS ("rss") in bytes.
+    """
+    if tracemalloc is None:
+        raise RuntimeError("Memory benchmark requires tracemalloc.")
+    if tracemalloc.is_tracing():
+        raise RuntimeError("Memory allocations are traced already.")
+
+    stages = {}
+
+    def run(name, function, *args):
+        rss = get_rss()
+        tracemalloc.start()
+        try:
+            result = function(*args)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if rss is not None:
+            rss = get_rss() - rss
+        stages[name] = {"peak": peak, "retained": retained, "rss": rss}
+        return result
+
+    gc.collect()
+    run_stages(html, run)
+    return stages
+
+
+def benchmark_memory(documents):
+    """
+    Measures memory of the stages for every document.
+
+    :returns dict: JSON serializable results.
+    """
+    results = []
+    for name, html in documents:
+        results.append({
+            "name": name,
+            "bytes": len(html),
+            "stages": measure_memory(html),
+        })
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "documents": results,
+        "peak_rss": get_peak_rss(),
+    }
@@ -0,0 +1,212 @@
+# -*- coding: utf8 -*-
+
+"""
+Regression gate comparing current timings and memory of the extraction
+against a stored baseline. Timings are normalized by speed of the
+machine measured by a calibration loop so the baseline recorded on one
+machine can be checked on another one. The calibration is measured
+next to every timing because speed of the machine may change during
+the measurement, e.g. by frequency scaling or by other processes.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import json
+import platform
+
+from os.path import dirname, join
+from timeit import default_timer
+
+from lxml.etree import tounicode
+
+from .. import __version__
+from ..document import build_document
+from .corpus import OPERATIONS, measure
+from .memory import measure_memory, tracemalloc
+from .scaling import measure_stages
+from .stages import STAGES
+from .synthetic import generate_page
+
+
+BASELINE_PATH = join(dirname(__file__), "baseline.json")
+# differences below are noise even if they are relatively big, the time
+# is relative to the calibration
+MIN_TIME_DELTA = 0.1
+MIN_MEMORY_DELTA = 64 * 1024
+
+
+def _calibration_workload(html):
+    # mix of pure Python and lxml work similar to the extraction
+    words = sum(len(w) for w in html.split())
+    dom = build_document(html)
+    for node in dom.iter():
+        node.text_content()
+
+    return words + len(tounicode(dom))
+
+
+def calibrate(repeat=5):
+    """
+    Measures speed of the machine by a fixed workload.
+
+    :returns float: The best time of the workload in seconds.
+    """
+    page = generate_page(paragraphs=50)
+    best_time, _ = measure(lambda: _calibration_workload(page), repeat)
+    return best_time
+
+
+def _calibrated(function):
+    """
+    Calls the function returning time(s) and returns them as multiples
+    of the calibration measured before and after the call.
+    """
+    calibration = calibrate()
+    result = function()
+    calibration = min(calibration, calibrate())
+
+    if isinstance(result, dict):
+        return dict((k, v / calibration) for k, v in result.items())
+    return result / calibration
+
+
+def collect_metrics(documents, repeat=3):
+    """
+    Measures the tracked metrics over the documents: the best time of
+    every operation over the whole corpus, sum of the best times of every
+    stage over the documents and the highest peak memory of every stage.
+
+    :returns dict: Mapping of metric names to values. Names of timings
+        start with "time." and they are multiples of the time of the
+        calibration workload. Names of memory start with "memory." and
+        they are in bytes.
+    """
+    metrics = {}
+    for name, function in OPERATIONS:
+        def run_corpus():
+            for _, html in documents:
+                function(html)
+
+        metrics["time.%s" % name] = _calibrated(
+            lambda: measure(run_corpus, repeat)[0])
+
+    for stage in STAGES:
+        metrics["time.stage.%s" % stage] = 0.0
+        if tracemalloc is not None:
+            metrics["memory.stage.%s" % stage] = 0
+
+    for _, html in documents:
+        times = _calibrated(lambda: measure_stages(html, repeat))
+        for stage in STAGES:
+            metrics["time.stage.%s" % stage] += times[stage]
+
+        if tracemalloc is not None:
+            for stage, memory in measure_memory(html).items():
+                key = "memory.stage.%s" % stage
+                metrics[key] = max(metrics[key], memory["peak"])
+
+    return metrics
+
+
+def get_corpus_identity(documents):
+    """Returns pairs ``[name, bytes]`` identifying the documents."""
+    return [[name, len(html)] for name, html in documents]
+
+
+def record_baseline(documents, repeat=3):
+    """
+    Measures the metrics and the speed of the machine.
+
+    :returns dict: JSON serializable baseline.
+    """
+    start = default_timer()
+    metrics = collect_metrics(documents, repeat)
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "corpus": get_corpus_identity(documents),
+        "calibration": calibrate(),
+        "metrics": metrics,
+        "duration": default_timer() - start,
+    }
+
+
+def load_baseline(path=None):
+    with open(path or BASELINE_PATH) as file:
+        return json.load(file)
+
+
+def compare_metrics(baseline, current, max_regression=0.2):
+    """
+    Compares the current metrics with the baseline. Metrics missing
+    in any of them are skipped.
+
+    :param baseline: Baseline as returned by `record_baseline`.
+    :param current: Current measurement as returned by `record_baseline`.
+    :param float max_regression: Allowed relative growth of a metric.
+    :returns list: Dictionary of comparison for every metric sorted
+        by the name. The metric is "regressed" if it grew more than
+        allowed and more than the noise.
+    """
+    results = []
+    for name in sorted(baseline["metrics"]):
+        if name not in current["metrics"]:
+            continue
+
+        expected = baseline["metrics"][name]
+        value = current["metrics"][name]
+        if name.startswith("time."):
+            min_delta = MIN_TIME_DELTA
+        else:
+            min_delta = MIN_MEMORY_DELTA
+
+        ratio = value / expected if expected else None
+        regressed = (
+            value - expected > min_delta and
+            (ratio is None or ratio > 1 + max_regression)
+        )
+        results.append({
+            "name": name,
+            "baseline": expected,
+            "current": value,
+            "ratio": ratio,
+            "regressed": regressed,
+        })
+
+    return results
+
+
+def check_baseline(baseline, documents, repeat=3, max_regression=0.2,
+                   attempts=3):
+    """
+    Measures the metrics and compares them with the baseline. When some
+    metric regressed, the measurement is repeated up to the count of
+    attempts and the best value of every metric is compared, so a short
+    slowdown of the machine isn't reported as a regression.
+
+    :returns list: Comparison of the metrics, see `compare_metrics`.
+    :raises ValueError: If the corpus is empty or it's not the corpus
+        the baseline was recorded over. The metrics are sums over
+        the corpus so they are not comparable then.
+    """
+    if not documents:
+        raise ValueError("The corpus is empty.")
+    if baseline.get("corpus") != get_corpus_identity(documents):
+        raise ValueError(
+            "The corpus differs from the corpus of the baseline.")
+
+    current = record_baseline(documents, repeat)
+    results = compare_metrics(baseline, current, max_regression)
+
+    for _ in range(attempts - 1):
+        if not any(result["regressed"] for result in results):
+            break
+
+        metrics = record_baseline(documents, repeat)["metrics"]
+        for name, value in metrics.items():
+            current["metrics"][name] = min(current["metrics"][name], value)
+        results = compare_metrics(baseline, current, max_regression)
+
+    return results
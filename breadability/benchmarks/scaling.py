@@ -0,0 +1,122 @@
+# -*- coding: utf8 -*-
+
+"""
+Scaling of the extraction stages with the size of the page. Time of
+every stage is measured over synthetic pages growing in one parameter
+and its growth is estimated as the exponent of a power law. Stages
+growing super-linearly with the count of elements are flagged.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import gc
+
+from math import log
+from timeit import default_timer
+
+from ..document import build_document
+from .stages import STAGES, run_stages
+from .synthetic import generate_page
+
+
+def measure_stages(html, repeat=3):
+    """
+    Runs all stages of the extraction of the HTML repeatedly.
+
+    :returns dict: The best time of every stage.
+    """
+    best_times = {}
+    for _ in range(repeat):
+        times = {}
+
+        def run(name, function, *args):
+            start = default_timer()
+            result = function(*args)
+            times[name] = default_timer() - start
+            return result
+
+        gc.collect()
+        run_stages(html, run)
+        times["total"] = sum(times.values())
+
+        for name, elapsed in times.items():
+            if name not in best_times or elapsed < best_times[name]:
+                best_times[name] = elapsed
+
+    return best_times
+
+
+def growth_exponent(sizes, times):
+    """
+    Estimates exponent ``k`` of ``time = c * size ** k`` by the least
+    squares fit in the log-log scale.
+
+    :returns float: The exponent or ``None`` if it can't be estimated.
+    """
+    points = [
+        (log(size), log(time))
+        for size, time in zip(sizes, times) if size > 0 and time > 0
+    ]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / variance
+
+
+def count_elements(html):
+    return sum(1 for _ in build_document(html).iter())
+
+
+def benchmark_scaling(parameter="paragraphs", values=(25, 50, 100, 200, 400),
+                      repeat=3, threshold=1.3, **options):
+    """
+    Measures the stages over synthetic pages generated with growing
+    value of the parameter of `generate_page`.
+
+    :param str parameter: Name of the growing parameter.
+    :param values: Values of the parameter.
+    :param float threshold: Stages with growth exponent over the
+        threshold are reported as super-linear.
+    :param options: Other parameters of `generate_page`.
+    :returns dict: JSON serializable results.
+    """
+    if parameter in options:
+        raise ValueError("Parameter %r is fixed in options." % parameter)
+
+    pages = []
+    for value in values:
+        options[parameter] = value
+        html = generate_page(**options)
+        pages.append({
+            "value": value,
+            "elements": count_elements(html),
+            "bytes": len(html.encode("utf8")),
+            "times": measure_stages(html, repeat),
+        })
+
+    elements = [page["elements"] for page in pages]
+    exponents = {}
+    for stage in STAGES + ("total",):
+        times = [page["times"][stage] for page in pages]
+        exponents[stage] = growth_exponent(elements, times)
+
+    superlinear = [
+        stage for stage in STAGES + ("total",)
+        if exponents[stage] is not None and exponents[stage] > threshold
+    ]
+
+    return {
+        "parameter": parameter,
+        "threshold": threshold,
+        "pages": pages,
+        "exponents": exponents,
+        "superlinear": superlinear,
+    }
@@ -0,0 +1,101 @@
+# -*- coding: utf8 -*-
+
+"""
+The extraction pipeline split into separately measurable stages. The
+stages do the same work as `breadability.readable.Article` for string
+input in the full mode, but every stage is called through a runner
+which can measure it.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from operator import attrgetter
+from lxml.etree import tounicode
+
+from ..annotated_text import AnnotatedTextHandler
+from ..document import (
+    build_document,
+    convert_breaks_to_paragraphs,
+    decode_html,
+)
+from ..readable import (
+    build_base_document,
+    build_error_document,
+    check_siblings,
+    copy_element,
+    drop_nodes_with_parents,
+    find_candidates,
+    html_cleaner,
+    leaf_div_elements_into_paragraphs,
+    prep_article,
+    remove_orphans,
+)
+
+
+STAGES = (
+    "decode", "parse", "clean", "score", "siblings", "prep", "serialize",
+    "annotate",
+)
+
+
+def _parse(html):
+    return build_document(convert_breaks_to_paragraphs(html))
+
+
+def _clean(dom):
+    html_cleaner(dom)
+    return leaf_div_elements_into_paragraphs(dom)
+
+
+def _score(dom):
+    candidates, unlikely_candidates = find_candidates(dom)
+    drop_nodes_with_parents(unlikely_candidates)
+    return candidates
+
+
+def _merge_siblings(dom, candidates):
+    if not candidates:
+        return dom
+
+    winner = max(candidates.values(), key=attrgetter("content_score"))
+    # the winner is cleaned out of the tree like by the article
+    return copy_element(check_siblings(winner, candidates).node)
+
+
+def _prep(dom, node):
+    cleaned = prep_article(node)
+    if cleaned is None and node is not dom:
+        # the article falls back to the whole document
+        cleaned = prep_article(dom)
+
+    if cleaned is None:
+        dom = build_error_document(None)
+    else:
+        dom = build_base_document(cleaned)
+    return remove_orphans(dom.get_element_by_id("readabilityBody"))
+
+
+def call_stage(name, function, *args):
+    """Default runner of the stages calling them without measurement."""
+    return function(*args)
+
+
+def run_stages(html, run=call_stage):
+    """
+    Extracts the article from the HTML stage by stage.
+
+    :param run: Callable ``run(name, function, *args)`` calling every
+        stage and returning its result, see `call_stage`.
+    :returns: The readable tree.
+    """
+    text = run("decode", decode_html, html)
+    dom = run("parse", _parse, text)
+    dom = run("clean", _clean, dom)
+    candidates = run("score", _score, dom)
+    node = run("siblings", _merge_siblings, dom, candidates)
+    readable = run("prep", _prep, dom, node)
+    run("serialize", tounicode, readable)
+    run("annotate", AnnotatedTextHandler.parse, readable)
+
+    return readable
@@ -0,0 +1,125 @@
+# -*- coding: utf8 -*-
+
+"""
+Generator of synthetic pages with controllable size and structure. The
+pages are deterministic for the given seed so measurements over them
+are repeatable.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from random import Random
+
+
+WORDS = (
+    "the", "of", "and", "to", "in", "is", "that", "for", "it", "as", "was",
+    "with", "be", "by", "on", "not", "he", "this", "are", "or", "his",
+    "from", "at", "which", "but", "have", "an", "had", "they", "you",
+    "were", "their", "one", "all", "we", "can", "her", "has", "there",
+    "been", "if", "more", "when", "will", "would", "who", "so", "no",
+    "article", "content", "reader", "story", "report", "market", "people",
+)
+ARTICLE_CLASS_NAMES = (
+    "content", "article", "body", "entry", "main", "text", "post",
+    "wrapper", "column", "box",
+)
+CLASS_NAMES = ARTICLE_CLASS_NAMES + (
+    "sidebar", "comment", "footer", "header", "menu", "nav", "related",
+    "share", "widget", "ad", "promo", "meta",
+)
+
+
+def generate_page(paragraphs=20, depth=3, link_density=0.1, table_rows=0,
+                  br_runs=0, class_names=CLASS_NAMES,
+                  article_class_names=ARTICLE_CLASS_NAMES, seed=0):
+    """
+    Generates HTML page with an article and boilerplate around it.
+
+    :param int paragraphs: Count of paragraphs of the article. There is
+        about one element of navigation, sidebar and comments for every
+        paragraph so the count of elements grows linearly with it.
+    :param int depth: Nesting depth of the <div> wrappers around the
+        article and around every boilerplate block.
+    :param float link_density: Fraction of words of the paragraphs
+        in links.
+    :param int table_rows: Rows of the table with 4 columns in the
+        article.
+    :param int br_runs: Count of runs of <br> elements in every
+        paragraph.
+    :param class_names: Vocabulary of class names of the wrappers
+        of boilerplate blocks.
+    :param article_class_names: Vocabulary of class names of the
+        wrappers of the article. They should not look unlikely
+        to contain the article.
+    :param int seed: Seed of the random generator.
+    :returns: The page as Unicode string.
+    """
+    random = Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><title>Synthetic page %d</title>"
+        "</head><body>" % paragraphs
+    ]
+
+    def open_wrappers(count, names=class_names):
+        for _ in range(count):
+            parts.append('<div class="%s %s">' % (
+                random.choice(names), random.choice(names)))
+
+    def close_wrappers(count):
+        parts.append("</div>" * count)
+
+    def sentence(words):
+        return " ".join(random.choice(WORDS) for _ in range(words))
+
+    # navigation
+    open_wrappers(depth)
+    parts.append('<ul class="nav">')
+    for i in range(paragraphs):
+        parts.append('<li><a href="/section/%d">%s</a></li>' % (
+            i, sentence(2)))
+    parts.append("</ul>")
+    close_wrappers(depth)
+
+    # article
+    open_wrappers(depth, article_class_names)
+    parts.append("<h1>%s</h1>" % sentence(8))
+    for i in range(paragraphs):
+        parts.append("<p>")
+        for run in range(br_runs + 1):
+            if run:
+                parts.append("<br>" * random.randint(2, 4))
+            for _ in range(random.randint(3, 6)):
+                words = random.randint(8, 20)
+                if random.random() < link_density:
+                    parts.append('<a href="/link/%d">%s</a>, ' % (
+                        i, sentence(words)))
+                else:
+                    parts.append(sentence(words) + ", ")
+            parts.append("end.")
+        parts.append("</p>")
+
+    if table_rows:
+        parts.append("<table>")
+        for row in range(table_rows):
+            parts.append("<tr>")
+            for column in range(4):
+                parts.append("<td>%s</td>" % sentence(3))
+            parts.append("</tr>")
+        parts.append("</table>")
+    close_wrappers(depth)
+
+    # sidebar and comments
+    open_wrappers(depth)
+    parts.append('<div class="sidebar">')
+    for i in range(paragraphs):
+        parts.append('<div class="widget"><a href="/related/%d">%s</a></div>'
+            % (i, sentence(4)))
+    parts.append('</div><div class="comments">')
+    for i in range(paragraphs):
+        parts.append('<div class="comment"><p>%s.</p></div>' % sentence(15))
+    parts.append("</div>")
+    close_wrappers(depth)
+
+    parts.append("</body></html>")
+    return "".join(parts)
@@ -4,14 +4,31 @@
 
 from __future__ import absolute_import
 
+import codecs
 import logging
 import re
 
+from copy import deepcopy
+from mmap import mmap, ACCESS_READ
+
 import chardet
-from lxml.etree import ParserError, XMLSyntaxError, tounicode
-from lxml.html import HTMLParser, document_fromstring
+from lxml.etree import (
+    ParserError,
+    XMLSyntaxError,
+    _ElementTree,
+    iselement,
+    tounicode,
+)
+from lxml.html import (
+    HTMLParser,
+    HtmlMixin,
+    document_fromstring,
+    fragment_fromstring,
+)
 
-from ._compat import to_bytes, to_unicode, unicode, unicode_compatible
+from ._compat import bytes, to_bytes, to_unicode, unicode, unicode_compatible
+from .journal import IN_PLACE
+from .timing import NO_TIMER
 from .utils import cached_property, ignored
 
 logger = logging.getLogger("breadability")
@@ -23,12 +40,19 @@ CHARSET_META_TAG_PATTERN = re.compile(
     br"""<meta[^>]+charset=["']?([^'"/>\s]+)""",
     re.IGNORECASE
 )
+CHARSET_PATTERN = re.compile(r"""charset=["']?([^'";\s]+)""", re.IGNORECASE)
+# end of the head is where the body starts if </head> is omitted
+HEAD_END_PATTERNS = {
+    unicode: re.compile(r"(</head\s*>)|<body[\s>]", re.IGNORECASE),
+    bytes: re.compile(br"(</head\s*>)|<body[\s>]", re.IGNORECASE),
+}
 
 
 def decode_html(html):
     """
     Converts bytes stream containing an HTML page into Unicode.
     Tries to guess character encoding from meta tag of by "chardet" library.
+    The stream may be any bytes-like object, e.g. memory mapped file.
     """
     if isinstance(html, unicode):
         return html
@@ -38,11 +62,11 @@ def decode_html(html):
         declared_encoding = match.group(1).decode("ASCII")
         # proceed unknown encoding as if it wasn't found at all
         with ignored(LookupError):
-            return html.decode(declared_encoding, "ignore")
+            return codecs.decode(html, declared_encoding, "ignore")
 
     # try to enforce UTF-8 firstly
     with ignored(UnicodeDecodeError):
-        return html.decode("utf8")
+        return codecs.decode(html, "utf8")
 
     text = TAG_MARK_PATTERN.sub(to_bytes(" "), html)
     diff = text.decode("utf8", "ignore").encode("utf8")
@@ -50,7 +74,7 @@ def decode_html(html):
 
     # 99% of text is UTF-8
     if abs(len(text) - len(diff)) < max(sizes) * 0.01:
-        return html.decode("utf8", "ignore")
+        return codecs.decode(html, "utf8", "ignore")
 
     # try detect encoding
     encoding = "utf8"
@@ -58,7 +82,20 @@ def decode_html(html):
     if encoding_detector["encoding"]:
         encoding = encoding_detector["encoding"]
 
-    return html.decode(encoding, "ignore")
+    return codecs.decode(html, encoding, "ignore")
+
+
+def map_file(path):
+    """
+    Maps content of the file into memory so it's read lazily by the OS
+    as it's processed and it's never copied into a Python string.
+    """
+    with open(path, "rb") as file:
+        try:
+            return mmap(file.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            # empty file can't be mapped
+            return to_bytes("")
 
 
 BREAK_TAGS_PATTERN = re.compile(
@@ -87,6 +124,75 @@ def _replace_break_tags(match):
         return tags
 
 
+# elements closing the opened paragraph
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "center", "dir", "div",
+    "dl", "fieldset", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "menu", "nav", "ol", "p", "pre", "section",
+    "table", "ul",
+))
+
+
+def convert_break_elements_to_paragraphs(document, journal=IN_PLACE):
+    """
+    Converts <hr> element and multiple <br> elements into paragraph.
+    Counterpart of `convert_breaks_to_paragraphs` for already parsed
+    documents. Content following the breaks up to the next block
+    element is wrapped into new <p> the same way the parser does
+    it with the output of `convert_breaks_to_paragraphs`.
+
+    :param journal: `breadability.journal.Journal` the changes
+        are done by.
+    """
+    logger.debug("Converting multiple <br> & <hr> elements into <p>.")
+
+    for element in tuple(document.iter("br", "hr")):
+        # element was removed with preceding breaks
+        if element.getparent() is None:
+            continue
+
+        breaks = [element]
+        sibling = element.getnext()
+        while _is_blank(breaks[-1].tail) and sibling is not None:
+            if sibling.tag not in ("br", "hr"):
+                break
+            breaks.append(sibling)
+            sibling = sibling.getnext()
+
+        if len(breaks) > 1 or element.tag == "hr":
+            _replace_break_elements(breaks, journal)
+
+    return document
+
+
+def _replace_break_elements(breaks, journal):
+    parent = breaks[0].getparent()
+    paragraph = parent.makeelement("p", {})
+    paragraph.text = breaks[-1].tail
+
+    sibling = breaks[-1].getnext()
+    while sibling is not None and sibling.tag not in BLOCK_TAGS:
+        next_sibling = sibling.getnext()
+        journal.move(sibling, paragraph)
+        sibling = next_sibling
+
+    if parent.tag == "p":
+        # nested paragraphs are not allowed so the new one follows
+        paragraph.tail = parent.tail
+        journal.set_tail(parent, None)
+        grand = parent.getparent()
+        journal.move(paragraph, grand, grand.index(parent) + 1)
+    else:
+        journal.move(paragraph, parent, parent.index(breaks[-1]) + 1)
+
+    for element in breaks:
+        journal.remove(element)
+
+
+def _is_blank(text):
+    return not text or text.isspace()
+
+
 def build_document(html_content, base_href=None):
     """Requires that the `html_content` not be None"""
     assert html_content is not None
@@ -99,6 +205,10 @@ def build_document(html_content, base_href=None):
     except (ParserError, XMLSyntaxError):
         raise ValueError("Failed to parse document contents.")
 
+    return _resolve_links(document, base_href)
+
+
+def _resolve_links(document, base_href):
     if base_href:
         document.make_links_absolute(base_href, resolve_base_href=True)
     else:
@@ -107,13 +217,117 @@ def build_document(html_content, base_href=None):
     return document
 
 
+def cut_head(html):
+    """
+    Returns beginning of the HTML up to the end of its head or ``None``
+    if the end of the head isn't found. Only the head is scanned.
+    """
+    text_type = unicode if isinstance(html, unicode) else bytes
+    match = HEAD_END_PATTERNS[text_type].search(html)
+    if match is None:
+        return None
+
+    end = match.start() if match.group(1) is None else match.end()
+    return html[:end]
+
+
+class Metadata(object):
+    """
+    Metadata of the document found in its head.
+
+    :ivar title: Text of <title> or ``None`` if there is no title.
+    :ivar description: Content of <meta name="description"> or ``None``.
+    :ivar canonical: Absolute URL from <link rel="canonical"> or ``None``.
+    :ivar charset: Declared character encoding or ``None``.
+    :ivar og: Dictionary of Open Graph properties like "og:title".
+    """
+    __slots__ = ("title", "description", "canonical", "charset", "og")
+
+    def __init__(self, title=None, description=None, canonical=None,
+                 charset=None, og=None):
+        self.title = title
+        self.description = description
+        self.canonical = canonical
+        self.charset = charset
+        self.og = {} if og is None else og
+
+    @classmethod
+    def from_dom(cls, dom):
+        """Collects metadata from parsed document with resolved links."""
+        metadata = cls(title=_get_title(dom))
+
+        for meta in dom.iter("meta"):
+            name = (meta.get("name") or "").lower()
+            property_ = meta.get("property") or ""
+            if name == "description":
+                metadata.description = meta.get("content")
+            elif property_.startswith("og:"):
+                metadata.og[property_] = meta.get("content")
+            elif meta.get("charset"):
+                metadata.charset = meta.get("charset").strip()
+            elif (meta.get("http-equiv") or "").lower() == "content-type":
+                match = CHARSET_PATTERN.search(meta.get("content") or "")
+                if match:
+                    metadata.charset = match.group(1)
+
+        for link in dom.iter("link"):
+            rel = (link.get("rel") or "").lower().split()
+            if "canonical" in rel and link.get("href"):
+                metadata.canonical = link.get("href")
+                break
+
+        return metadata
+
+    def __repr__(self):
+        return "<Metadata %r>" % self.title
+
+
+def _get_title(dom):
+    title_element = dom.find(".//title")
+    if title_element is None:
+        return None
+    elif title_element.text is None:
+        return ""
+    else:
+        return title_element.text.strip()
+
+
+def get_tree_root(html):
+    """
+    Returns root element of the input if it's already parsed
+    lxml tree. Otherwise ``None`` is returned.
+    """
+    if isinstance(html, _ElementTree):
+        return html.getroot()
+    elif iselement(html):
+        return html
+    else:
+        return None
+
+
 @unicode_compatible
 class OriginalDocument(object):
     """The original document to process."""
 
-    def __init__(self, html, url=None):
+    def __init__(self, html, url=None, mutate_input=False, journal=None,
+                 timer=NO_TIMER):
+        """
+        :param html: The HTML as string, bytes-like object or lxml tree
+            parsed by `lxml.html`.
+        :param url: The url so we can adjust the links to still work.
+        :param bool mutate_input: If True the given lxml tree is
+            processed in place. Otherwise it's copied.
+        :param journal: Optional `breadability.journal.Journal` the given
+            lxml tree is processed in place by so the changes can be
+            reverted. Links are not resolved then, see `resolve_links`.
+        :param timer: `breadability.timing.StageTimer` measuring
+            the parsing.
+        """
         self._html = html
         self._url = url
+        self._mutate_input = mutate_input
+        self._journal = journal
+        self._timer = timer
 
     @property
     def url(self):
@@ -128,24 +342,102 @@ class OriginalDocument(object):
     def dom(self):
         """Parsed HTML document from the input."""
         html = self._html
+        timer = self._timer
+
+        root = get_tree_root(html)
+        if root is not None:
+            if not isinstance(root, HtmlMixin):
+                raise TypeError("Only trees parsed by lxml.html are supported.")
+            if self._journal is not None:
+                with timer.measure("convert_break_elements_to_paragraphs"):
+                    return convert_break_elements_to_paragraphs(
+                        root, self._journal)
+            if not self._mutate_input:
+                root = deepcopy(root)
+
+            with timer.measure("convert_break_elements_to_paragraphs"):
+                convert_break_elements_to_paragraphs(root)
+            return _resolve_links(root, self._url)
+
         if not isinstance(html, unicode):
-            html = decode_html(html)
+            with timer.measure("decode_html"):
+                html = decode_html(html)
 
-        html = convert_breaks_to_paragraphs(html)
-        document = build_document(html, self._url)
+        with timer.measure("convert_breaks_to_paragraphs"):
+            html = convert_breaks_to_paragraphs(html)
+        with timer.measure("build_document"):
+            document = build_document(html, self._url)
 
         return document
 
+    def resolve_links(self, element):
+        """
+        Makes links in the element copied out of the `dom` absolute
+        the same way as links of the `dom` are resolved. Only needed
+        if the tree is processed by a journal.
+        """
+        base_href = None
+        for base in self._get_source_dom().xpath("//base[@href]"):
+            base_href = base.get("href")
+        for base in element.xpath("descendant-or-self::base[@href]"):
+            base.drop_tree()
+
+        if base_href:
+            element.make_links_absolute(base_href, resolve_base_href=False)
+        if self._url:
+            element.make_links_absolute(self._url, resolve_base_href=False)
+
+        return element
+
     @cached_property
     def links(self):
         """Links within the document."""
         return self.dom.findall(".//a")
 
+    @cached_property
+    def metadata(self):
+        """
+        `Metadata` of the document. Only the head of the HTML is parsed
+        for them unless the whole document is parsed already.
+        """
+        html = self._html
+        parsed = "_cached_property_dom" in self.__dict__
+        if parsed or get_tree_root(html) is not None:
+            metadata = Metadata.from_dom(self._get_source_dom())
+            if self._journal is not None and metadata.canonical:
+                # links of the tree processed by journal are not resolved
+                link = fragment_fromstring("<a/>")
+                link.set("href", metadata.canonical)
+                metadata.canonical = self.resolve_links(link).get("href")
+            return metadata
+
+        head = cut_head(html)
+        if head is None:
+            return Metadata.from_dom(self.dom)
+        if not isinstance(head, unicode):
+            head = decode_html(head)
+
+        try:
+            return Metadata.from_dom(build_document(head, self._url))
+        except ValueError:
+            return Metadata()
+
     @cached_property
     def title(self):
         """Title attribute of the parsed document."""
-        title_element = self.dom.find(".//title")
-        if title_element is None or title_element.text is None:
-            return ""
-        else:
-            return title_element.text.strip()
+        title = self.metadata.title
+        if title is None:
+            # <title> may be misplaced out of the head
+            title = _get_title(self._get_source_dom())
+
+        return title or ""
+
+    def _get_source_dom(self):
+        """
+        Returns the tree metadata are read from. The given lxml tree
+        processed by the journal is read directly so it's not changed.
+        """
+        if self._journal is not None:
+            return get_tree_root(self._html)
+
+        return self.dom
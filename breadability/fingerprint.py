@@ -0,0 +1,230 @@
+# -*- coding: utf8 -*-
+
+"""
+Near-duplicate detection of extracted articles by SimHash of their text.
+Texts sharing most of their word shingles get fingerprints differing
+only in a few bits, so articles syndicated across sites (with different
+boilerplate, headings or a few edited words) can be grouped cheaply.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import re
+
+from collections import defaultdict
+from hashlib import md5
+
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SimHash(object):
+    """
+    Computes SimHash of the text fed piece by piece, e.g. paragraph by
+    paragraph as they're extracted. Features are shingles of the
+    consecutive lowercased words and they can span the fed pieces.
+    """
+
+    def __init__(self):
+        self._words = ()
+        self._features = defaultdict(int)
+
+    def update(self, text):
+        features = self._features
+        words = self._words + tuple(WORD_PATTERN.findall(text.lower()))
+
+        for i in range(len(words) - SHINGLE_SIZE + 1):
+            features[words[i:i + SHINGLE_SIZE]] += 1
+
+        self._words = words[-(SHINGLE_SIZE - 1):]
+
+    def digest(self):
+        """
+        Returns the fingerprint as an unsigned integer or ``None``
+        if the text has fewer words than a single shingle.
+        """
+        weights = defaultdict(int)
+        for shingle, count in self._features.items():
+            weights[_hash_shingle(shingle)] += count
+
+        # texts shorter than a shingle are fingerprinted by all their words
+        if not weights and self._words:
+            weights[_hash_shingle(self._words)] = 1
+        if not weights:
+            return None
+
+        # all bits are counted at once in the fields of one big integer
+        counters = 0
+        for value, weight in weights.items():
+            counters += weight * _spread_bits(value)
+
+        half = sum(weights.values()) / 2
+        fingerprint = 0
+        for bit in range(FINGERPRINT_BITS):
+            if (counters >> (bit * _COUNTER_BITS)) & _COUNTER_MASK > half:
+                fingerprint |= 1 << bit
+
+        return fingerprint
+
+
+_COUNTER_BITS = 32
+_COUNTER_MASK = (1 << _COUNTER_BITS) - 1
+# every bit of a byte moved to the lowest bit of its own counter
+_SPREAD_BYTES = tuple(
+    sum(1 << (bit * _COUNTER_BITS) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+)
+
+
+def _spread_bits(value):
+    spread = 0
+    for i in range(FINGERPRINT_BITS // 8):
+        byte = value >> (i * 8) & 0xFF
+        if byte:
+            spread |= _SPREAD_BYTES[byte] << (i * 8 * _COUNTER_BITS)
+
+    return spread
+
+
+def _hash_shingle(shingle):
+    digest = md5(" ".join(shingle).encode("utf8")).hexdigest()
+    return int(digest[:FINGERPRINT_BITS // 4], 16)
+
+
+def simhash(paragraphs):
+    """
+    Returns SimHash fingerprint of the given text paragraphs,
+    see `SimHash.digest`.
+    """
+    hasher = SimHash()
+    for paragraph in paragraphs:
+        hasher.update(paragraph)
+
+    return hasher.digest()
+
+
+def hamming_distance(first, second):
+    """Returns count of bits the fingerprints differ in."""
+    return bin(first ^ second).count("1")
+
+
+class SimHashIndex(object):
+    """
+    In-memory index of fingerprints for grouping near-duplicates in
+    a batch. Fingerprints are split into ``max_distance + 1`` blocks and
+    indexed by each of them. Fingerprints differing in at most
+    ``max_distance`` bits share at least one block, so only fingerprints
+    in the same buckets are compared.
+
+    :param int max_distance: Maximal Hamming distance of fingerprints
+        of near-duplicates.
+    """
+
+    def __init__(self, max_distance=3):
+        self.max_distance = max_distance
+        self._blocks = _split_blocks(max_distance + 1)
+        self._buckets = defaultdict(list)
+        self._fingerprints = {}
+        self._keys = []
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def add(self, key, fingerprint):
+        """
+        Adds the fingerprint under the unique key, e.g. URL of the
+        article. Fingerprints ``None`` of articles without text are
+        ignored.
+        """
+        if fingerprint is None:
+            return
+
+        self._fingerprints[key] = fingerprint
+        self._keys.append(key)
+        for bucket in self._iter_buckets(fingerprint):
+            self._buckets[bucket].append(key)
+
+    def find(self, fingerprint):
+        """Returns keys of near-duplicates of the fingerprint."""
+        if fingerprint is None:
+            return []
+
+        keys = []
+        seen = set()
+        fingerprints = self._fingerprints
+        for bucket in self._iter_buckets(fingerprint):
+            for key in self._buckets.get(bucket, ()):
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                distance = hamming_distance(fingerprint, fingerprints[key])
+                if distance <= self.max_distance:
+                    keys.append(key)
+
+        return keys
+
+    def groups(self):
+        """
+        Returns lists of keys of near-duplicates in the order they were
+        added. Near-duplicates are grouped transitively and every key is
+        in exactly one group.
+        """
+        roots = {}
+
+        def find_root(key):
+            while roots.setdefault(key, key) != key:
+                # halves the path for the next lookups
+                roots[key] = roots[roots[key]]
+                key = roots[key]
+            return key
+
+        def union(key, other):
+            root, other_root = find_root(key), find_root(other)
+            if root != other_root:
+                roots[other_root] = root
+
+        fingerprints = self._fingerprints
+        for keys in self._buckets.values():
+            # keys of the same fingerprint are duplicates without comparing
+            distinct = {}
+            for key in keys:
+                first = distinct.setdefault(fingerprints[key], key)
+                if first != key:
+                    union(first, key)
+
+            distinct = list(distinct.items())
+            for i, (fingerprint, key) in enumerate(distinct):
+                for other_fingerprint, other in distinct[i + 1:]:
+                    distance = hamming_distance(fingerprint, other_fingerprint)
+                    if distance <= self.max_distance:
+                        union(key, other)
+
+        groups = defaultdict(list)
+        order = []
+        for key in self._keys:
+            root = find_root(key)
+            if root not in groups:
+                order.append(root)
+            groups[root].append(key)
+
+        return [groups[root] for root in order]
+
+    def _iter_buckets(self, fingerprint):
+        for i, (shift, mask) in enumerate(self._blocks):
+            yield i, (fingerprint >> shift) & mask
+
+
+def _split_blocks(count):
+    """Returns pairs ``(shift, mask)`` of blocks covering all bits."""
+    blocks = []
+    shift = 0
+    for i in range(count):
+        size = (FINGERPRINT_BITS - shift) // (count - i)
+        blocks.append((shift, (1 << size) - 1))
+        shift += size
+
+    return blocks
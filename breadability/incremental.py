@@ -0,0 +1,69 @@
+# -*- coding: utf8 -*-
+
+"""
+Incremental extraction of lightly changed versions of the same page.
+Elements are identified by fingerprints of their content so unchanged
+parts of the page are recognized wherever they moved.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from hashlib import md5
+from lxml.etree import iterwalk
+
+from ._compat import string_types
+
+
+def fingerprint_subtrees(root):
+    """
+    Computes content fingerprint of every element in the tree. The
+    fingerprint depends on the tag, attributes and text of the element
+    and on the fingerprints of its children, not on its position.
+
+    :returns dict: Mapping of elements to their fingerprints.
+    """
+    fingerprints = {}
+
+    for _, node in iterwalk(root, events=("end",)):
+        tag = node.tag
+        parts = [tag if isinstance(tag, string_types) else "", node.text or ""]
+        parts.extend("%s=%s" % item for item in sorted(node.items()))
+        for child in node:
+            parts.append(fingerprints.get(child) or child.text or "")
+            parts.append(child.tail or "")
+
+        digest = md5("\0".join(parts).encode("utf8"))
+        fingerprints[node] = digest.hexdigest()[:16]
+
+    return fingerprints
+
+
+class ExtractionState(object):
+    """
+    State of the extraction kept for the next version of the page,
+    see `breadability.readable.Article.extraction_state`.
+
+    :ivar scores: Mapping of fingerprints of candidates to their scores.
+    :ivar winner: Fingerprint of the candidate the article was built from.
+    :ivar winner_parent: Fingerprint of the parent of the winner. The
+        siblings of the winner can be merged into the article.
+    :ivar readable: The readable article as returned by `Article.readable`.
+    :ivar options: Options of the extraction the state is valid for.
+    """
+    __slots__ = ("scores", "winner", "winner_parent", "readable", "options")
+
+    def __init__(self, scores, winner, winner_parent, readable, options):
+        self.scores = scores
+        self.winner = winner
+        self.winner_parent = winner_parent
+        self.readable = readable
+        self.options = options
+
+    def __reduce__(self):
+        return (self.__class__, (
+            self.scores, self.winner, self.winner_parent, self.readable,
+            self.options))
+
+    def __repr__(self):
+        return "<ExtractionState with %d candidates>" % len(self.scores)
@@ -0,0 +1,94 @@
+# -*- coding: utf8 -*-
+
+"""
+Optional counting of the expensive primitives called during processing
+of a document. Counters are activated for the current thread by
+`counting`. Functions of breadability look up the primitives they call
+by `counted` once before their loops, so nothing is spent per call
+when nothing is counted.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from contextlib import contextmanager
+from threading import Lock, local
+from timeit import default_timer
+
+
+_state = local()
+# count of active `counting` contexts in all threads
+_active = 0
+_lock = Lock()
+
+
+class OperationCounters(object):
+    """Count of calls and total time of every counted operation."""
+
+    def __init__(self):
+        self._operations = {}
+
+    @property
+    def operations(self):
+        """
+        Mapping of names of the operations to pairs ``(calls, time)``
+        with the time in seconds.
+        """
+        return dict(self._operations)
+
+    def add(self, operation, elapsed):
+        calls, total = self._operations.get(operation, (0, 0.0))
+        self._operations[operation] = (calls + 1, total + elapsed)
+
+
+def counted(operation, function):
+    """
+    Returns the function counted as the operation if some counters are
+    active in the current thread, otherwise the function itself.
+    """
+    # the thread-local lookup is skipped when nothing is counted at all
+    if not _active:
+        return function
+
+    counters = getattr(_state, "counters", None)
+    if counters is None:
+        return function
+
+    def counted_function(*args):
+        start = default_timer()
+        try:
+            return function(*args)
+        finally:
+            counters.add(operation, default_timer() - start)
+
+    return counted_function
+
+
+def call(operation, function, *args):
+    """Calls the function and counts it as the operation."""
+    return counted(operation, function)(*args)
+
+
+@contextmanager
+def counting(counters):
+    """
+    Counts operations called in the current thread within the context
+    into the counters. Nothing is changed if counters are ``None``.
+    """
+    global _active
+
+    if counters is None:
+        yield
+        return
+
+    with _lock:
+        _active += 1
+
+    previous = getattr(_state, "counters", None)
+    _state.counters = counters
+    try:
+        yield
+    finally:
+        _state.counters = previous
+        with _lock:
+            _active -= 1
@@ -0,0 +1,155 @@
+# -*- coding: utf8 -*-
+
+"""
+Journal of changes made to the tree during extraction. Recorded changes
+are reverted so the tree given by the caller is left intact.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from .instrumentation import counted
+
+
+class Journal(object):
+    """
+    Applies changes of elements and records how to revert them.
+    Only the changes done by the journal are recorded so the tree
+    must not be changed other way until `rollback` is called.
+
+    :param bool recording: If False changes are applied only and
+        nothing is recorded. Such journal holds no state.
+    """
+
+    def __init__(self, recording=True):
+        self.recording = recording
+        self._undo = []
+        self._redo = []
+
+    def retag(self, node, tag):
+        """Changes tag of the element."""
+        self._record(_TAG, node, None, node.tag, tag)
+        node.tag = tag
+
+    def set(self, node, name, value):
+        """Sets attribute of the element."""
+        self._record(_ATTRIBUTE, node, name, node.get(name), value)
+        node.set(name, value)
+
+    def set_text(self, node, text):
+        self._record(_TEXT, node, None, node.text, text)
+        node.text = text
+
+    def set_tail(self, node, tail):
+        self._record(_TAIL, node, None, node.tail, tail)
+        node.tail = tail
+
+    def move(self, node, parent, index=None):
+        """
+        Moves the element (with its tail) under the parent at the index.
+        The element is appended if index is ``None``. New elements
+        are inserted into the tree the same way.
+        """
+        if self.recording:
+            position = _get_position(node)
+
+        if index is None:
+            parent.append(node)
+        else:
+            parent.insert(index, node)
+
+        if self.recording:
+            self._record(
+                _POSITION, node, None, position, _get_position(node))
+
+    def remove(self, node):
+        """Removes the element with its tail from the tree."""
+        if self.recording:
+            self._record(
+                _POSITION, node, None, _get_position(node), (None, None))
+        node.getparent().remove(node)
+
+    def drop_tree(self, node):
+        """
+        Removes the element with its content but keeps its tail the same
+        way as `lxml.html.HtmlElement.drop_tree` does.
+        """
+        counted("drop_tree", self._drop_tree)(node)
+
+    def _drop_tree(self, node):
+        if node.tail:
+            previous = node.getprevious()
+            if previous is None:
+                parent = node.getparent()
+                self.set_text(parent, (parent.text or "") + node.tail)
+            else:
+                self.set_tail(previous, (previous.tail or "") + node.tail)
+
+        self.remove(node)
+
+    def rollback(self):
+        """
+        Reverts all recorded changes in the reverse order. Reverted
+        changes can be applied again by `replay`.
+        """
+        while self._undo:
+            change = self._undo.pop()
+            _apply(change, change[3])
+            self._redo.append(change)
+
+    def replay(self):
+        """
+        Applies changes reverted by `rollback` again. The tree must
+        not be changed in between.
+
+        :returns bool: True if there were changes to apply.
+        """
+        replayed = bool(self._redo)
+        while self._redo:
+            change = self._redo.pop()
+            _apply(change, change[4])
+            self._undo.append(change)
+
+        return replayed
+
+    def _record(self, kind, node, name, old_value, new_value):
+        if self.recording:
+            self._undo.append((kind, node, name, old_value, new_value))
+            del self._redo[:]
+
+
+_TAG, _TEXT, _TAIL, _ATTRIBUTE, _POSITION = (
+    "tag", "text", "tail", "attribute", "position")
+
+
+def _get_position(node):
+    parent = node.getparent()
+    if parent is None:
+        return None, None
+
+    return parent, parent.index(node)
+
+
+def _apply(change, value):
+    kind, node, name = change[:3]
+    if kind == _TAG:
+        node.tag = value
+    elif kind == _TEXT:
+        node.text = value
+    elif kind == _TAIL:
+        node.tail = value
+    elif kind == _ATTRIBUTE:
+        if value is None:
+            del node.attrib[name]
+        else:
+            node.set(name, value)
+    else:
+        parent, index = value
+        if parent is None:
+            node.getparent().remove(node)
+        else:
+            parent.insert(index, node)
+
+
+# journal applying changes directly to the tree
+IN_PLACE = Journal(recording=False)
@@ -0,0 +1,191 @@
+# -*- coding: utf8 -*-
+
+"""Limits of the work spent on processing of a single document."""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import logging
+
+from timeit import default_timer
+
+from ._compat import string_types, unicode
+
+
+logger = logging.getLogger("breadability")
+
+
+class LimitExceeded(Exception):
+    """Raised by the traversal loops when some of the limits is hit."""
+
+    def __init__(self, limit):
+        super(LimitExceeded, self).__init__("Limit '%s' exceeded." % limit)
+        self.limit = limit
+
+
+class Limits(object):
+    """
+    Limits for processing of a single document. The instance holds
+    no state so it can be shared by many documents. Every limit is
+    optional and ``None`` means unlimited.
+
+    :param int max_bytes: Maximal length of the input in bytes, text
+        is measured in UTF-8. Longer input is truncated before it's
+        parsed.
+    :param int max_elements: Maximal count of traversed elements.
+    :param int max_depth: Maximal nesting depth of elements.
+    :param float timeout: Wall-clock time in seconds measured from
+        the creation of the document.
+    """
+
+    def __init__(self, max_bytes=None, max_elements=None, max_depth=None,
+                 timeout=None):
+        self.max_bytes = max_bytes
+        self.max_elements = max_elements
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def budget(self):
+        """Starts tracking of the limits for a new document."""
+        return Budget(self)
+
+
+class Budget(object):
+    """Consumption of the `Limits` by a single document."""
+
+    def __init__(self, limits):
+        self._limits = limits
+        self._elements_count = 0
+        self._ancestors = []
+        self.exceeded = None
+
+        if limits.timeout is None:
+            self._deadline = None
+        else:
+            self._deadline = default_timer() + limits.timeout
+
+    def truncate(self, html):
+        """Returns input shortened to the allowed size."""
+        max_bytes = self._limits.max_bytes
+        if max_bytes is None or len(html) <= max_bytes // 4:
+            # a character takes up to 4 bytes in UTF-8
+            return html
+
+        truncated = html
+        if isinstance(html, unicode):
+            truncated = html.encode("utf8")
+        if len(truncated) <= max_bytes:
+            return html
+
+        self._exceed("max_bytes")
+        truncated = truncated[:max_bytes]
+        if isinstance(html, unicode):
+            # the last character may be cut in the middle
+            truncated = truncated.decode("utf8", "ignore")
+        return truncated
+
+    def check_time(self):
+        """Raises `LimitExceeded` if the deadline passed."""
+        if self._deadline is not None and default_timer() > self._deadline:
+            raise self._exceed("timeout")
+
+    def until_deadline(self, nodes):
+        """
+        Yields the given nodes until the deadline passes. Then the
+        iteration is silently stopped.
+        """
+        for node in nodes:
+            try:
+                self.check_time()
+            except LimitExceeded as e:
+                logger.info("Processing truncated: %s", e)
+                return
+
+            yield node
+
+    def visit(self, node):
+        """
+        Accounts traversed element. Elements have to be visited in
+        the document order so the parent is always visited first.
+        """
+        self._elements_count += 1
+        max_elements = self._limits.max_elements
+        if max_elements is not None and self._elements_count > max_elements:
+            raise self._exceed("max_elements")
+
+        max_depth = self._limits.max_depth
+        if max_depth is not None:
+            parent = node.getparent()
+            ancestors = self._ancestors
+            while ancestors and ancestors[-1] is not parent:
+                ancestors.pop()
+
+            ancestors.append(node)
+            if len(ancestors) > max_depth:
+                raise self._exceed("max_depth")
+
+        self.check_time()
+
+    def copy_within(self, element):
+        """
+        Returns copy of the element with only its first descendants
+        in the document order within `max_elements` and `max_depth`,
+        counted from the element. Descendants at the maximal depth are
+        replaced by their text. Comments and other non-elements are left
+        out but their tail text is kept.
+        """
+        max_elements = self._limits.max_elements
+        max_depth = self._limits.max_depth
+
+        copy = element.makeelement(element.tag, element.attrib)
+        copy.text = element.text
+        count = 1
+        stack = [(iter(element), copy, 1)]
+        while stack:
+            children, parent, depth = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+
+            if not isinstance(child.tag, string_types):
+                _append_text(parent, child.tail)
+                continue
+            if max_elements is not None and count >= max_elements:
+                break
+            if max_depth is not None and depth >= max_depth:
+                _append_text(parent, child.text_content())
+                _append_text(parent, child.tail)
+                count += 1
+                continue
+
+            child_copy = parent.makeelement(child.tag, child.attrib)
+            child_copy.text = child.text
+            child_copy.tail = child.tail
+            parent.append(child_copy)
+            count += 1
+            stack.append((iter(child), child_copy, depth + 1))
+
+        return copy
+
+    def release(self):
+        """Drops references to the visited elements."""
+        self._ancestors = []
+
+    def _exceed(self, limit):
+        # only the first hit limit is reported
+        if self.exceeded is None:
+            self.exceeded = limit
+
+        return LimitExceeded(limit)
+
+
+def _append_text(parent, text):
+    if not text:
+        return
+
+    if len(parent):
+        last = parent[-1]
+        last.tail = (last.tail or "") + text
+    else:
+        parent.text = (parent.text or "") + text
@@ -0,0 +1,242 @@
+# -*- coding: utf8 -*-
+
+"""
+Metrics of extraction for long-running processes. Metrics are kept
+in a `MetricsRegistry` and exported in the text format of Prometheus.
+`ExtractionMetrics` defines the metrics of breadability and it's passed
+to the `breadability.readable.Article` which updates them.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from threading import Lock
+
+
+# in seconds
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0,
+)
+# in characters or bytes of the input
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(8))
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return "%d" % value
+
+
+def _escape(value):
+    return (
+        ("%s" % value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+
+    return "{%s}" % ",".join(
+        '%s="%s"' % (name, _escape(value)) for name, value in pairs)
+
+
+class Metric(object):
+    """
+    Base of metrics with optional labels. Every combination of values
+    of the labels is a separate series.
+    """
+    type = None
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._series = {}
+        self._lock = Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError("Metric %s has labels %s, given %s." % (
+                self.name, ", ".join(self.labels), ", ".join(sorted(labels))))
+
+        return tuple("%s" % labels[name] for name in self.labels)
+
+    def export(self):
+        """Returns lines of the metric in the text format."""
+        lines = [
+            "# HELP %s %s" % (self.name, self.description),
+            "# TYPE %s %s" % (self.name, self.type),
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+        if not series and not self.labels:
+            series = [((), self._empty())]
+
+        for key, value in series:
+            lines.extend(self._export_series(key, value))
+
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically growing count."""
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+    def _empty(self):
+        return 0
+
+    def _export_series(self, key, value):
+        yield "%s%s %s" % (
+            self.name, _format_labels(self.labels, key), _format_value(value))
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values counted in cumulative buckets
+    with the sum and the count of all values.
+
+    :param buckets: Sorted upper bounds of the buckets. The bucket
+        of infinity is added.
+    """
+    type = "histogram"
+
+    def __init__(self, name, description, buckets, labels=()):
+        super(Histogram, self).__init__(name, description, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # exported series are not changed in place
+            counts, total = self._series.get(key) or self._empty()
+            counts = list(counts)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels):
+        counts, _ = self._series.get(self._key(labels)) or self._empty()
+        return sum(counts)
+
+    def _empty(self):
+        return [0] * len(self.buckets), 0.0
+
+    def _export_series(self, key, value):
+        counts, total = value
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            labels = _format_labels(
+                self.labels, key, [("le", _format_value(float(bound)))])
+            yield "%s_bucket%s %d" % (self.name, labels, cumulative)
+
+        labels = _format_labels(self.labels, key)
+        yield "%s_sum%s %s" % (self.name, labels, _format_value(total))
+        yield "%s_count%s %d" % (self.name, labels, cumulative)
+
+
+class MetricsRegistry(object):
+    """Named metrics exported together."""
+
+    def __init__(self):
+        self._metrics = []
+        self._names = set()
+
+    def register(self, metric):
+        if metric.name in self._names:
+            raise ValueError("Metric %s is registered already." % metric.name)
+
+        self._names.add(metric.name)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, description, labels=()):
+        return self.register(Counter(name, description, labels))
+
+    def histogram(self, name, description, buckets, labels=()):
+        return self.register(Histogram(name, description, buckets, labels))
+
+    def export(self):
+        """Returns all metrics in the text format of Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.export())
+
+        return "\n".join(lines) + "\n"
+
+
+class ExtractionMetrics(object):
+    """
+    Metrics of articles processed with it. The instance is shared
+    by all articles of the process and it's safe to use it from
+    several threads.
+
+    :param registry: `MetricsRegistry` the metrics are registered to,
+        a new one by default.
+    :param str prefix: Prefix of names of the metrics.
+    """
+
+    def __init__(self, registry=None, prefix="breadability"):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.documents = self.registry.counter(
+            prefix + "_documents_total",
+            "Documents the readable article was extracted from.")
+        self.failures = self.registry.counter(
+            prefix + "_failures_total",
+            "Extractions failed by an exception.", ("exception",))
+        self.fallbacks = self.registry.counter(
+            prefix + "_fallbacks_total",
+            "Extractions falling back to the whole document or to the "
+            "error document.", ("reason",))
+        self.stage_seconds = self.registry.histogram(
+            prefix + "_stage_seconds",
+            "Wall time of the stages of the processing.", LATENCY_BUCKETS,
+            ("stage",))
+        self.input_size = self.registry.histogram(
+            prefix + "_input_size",
+            "Length of the input HTML in bytes or characters.", SIZE_BUCKETS)
+        self.cache_lookups = self.registry.counter(
+            prefix + "_cache_lookups_total",
+            "Lookups of results of the previous extraction: the readable "
+            "article and scores of candidates.", ("cache", "result"))
+
+    def observe_stage(self, stage, wall, cpu):
+        """Callback of `breadability.timing.StageTimer`."""
+        self.stage_seconds.observe(wall, stage=stage)
+
+    def cache_lookup(self, cache, hits, misses=0):
+        """Counts hits and misses of lookups of the cache."""
+        if hits:
+            self.cache_lookups.inc(hits, cache=cache, result="hit")
+        if misses:
+            self.cache_lookups.inc(misses, cache=cache, result="miss")
+
+    def cache_hit_ratio(self, cache):
+        """
+        Returns the ratio of hits to all lookups of the cache ("readable"
+        or "scores") or ``None`` if it wasn't looked up yet.
+        """
+        hits = self.cache_lookups.value(cache=cache, result="hit")
+        misses = self.cache_lookups.value(cache=cache, result="miss")
+        return hits / (hits + misses) if hits + misses else None
+
+    def export(self):
+        return self.registry.export()
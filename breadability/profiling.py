@@ -0,0 +1,170 @@
+# -*- coding: utf8 -*-
+
+"""
+Sampling profiler for batch processing of documents. Only some documents
+are profiled, every n-th one and the ones slower than a threshold, so
+pathological pages can be found in production traffic without the
+overhead of profiling everything. Statistics of all profiled documents
+are aggregated into a single report and inputs of the slowest documents
+are kept so they can be replayed later.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import cProfile
+import heapq
+import json
+import os
+import pstats
+import re
+
+from os.path import join
+from timeit import default_timer
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from ._compat import to_bytes
+
+
+class SamplingProfiler(object):
+    """
+    Profiles sampled documents of a batch run.
+
+    :param int every: Profile every n-th document, the first one
+        included. Nothing is sampled this way if it's ``None``.
+    :param float threshold: Latency in seconds. Document processed
+        slower than that is processed again under the profiler, so the
+        processing has to be repeatable. Nothing is re-run if it's
+        ``None``.
+    :param int keep_slowest: Count of the slowest documents whose
+        inputs are kept for `save_slowest`. Latency of documents sampled
+        by `every` includes overhead of the profiler.
+    """
+
+    def __init__(self, every=None, threshold=None, keep_slowest=10):
+        self.every = every
+        self.threshold = threshold
+        self.keep_slowest = keep_slowest
+        self.documents = 0
+        self.profiled = 0
+        self._stats = None
+        # min-heap of (latency, order, name, html)
+        self._slowest = []
+
+    @property
+    def slowest(self):
+        """
+        Pairs ``(name, latency)`` of the kept slowest documents,
+        the slowest first.
+        """
+        return [
+            (name, latency)
+            for latency, _, name, _ in sorted(self._slowest, reverse=True)
+        ]
+
+    def call(self, name, html, function):
+        """
+        Calls ``function(html)`` for the document and profiles it if it
+        is sampled.
+
+        :param name: Name of the document, e.g. its URL.
+        :returns: Result of the function.
+        """
+        self.documents += 1
+        sampled = (
+            self.every is not None and (self.documents - 1) % self.every == 0)
+
+        start = default_timer()
+        if sampled:
+            result = self._profile(function, html)
+        else:
+            result = function(html)
+        latency = default_timer() - start
+
+        if (not sampled and self.threshold is not None and
+                latency > self.threshold):
+            self._profile(function, html)
+
+        self._keep(latency, name, html)
+        return result
+
+    def report(self, sort="cumulative", limit=30):
+        """
+        Returns the aggregated statistics of the profiled documents
+        as text in the format of `pstats`.
+
+        :param sort: Key the functions are sorted by.
+        :param int limit: Count of the reported functions.
+        """
+        if self._stats is None:
+            return "No document was profiled.\n"
+
+        stream = StringIO()
+        self._stats.stream = stream
+        self._stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump_stats(self, path):
+        """
+        Writes the aggregated statistics to the file readable by
+        `pstats` and other profile viewers.
+        """
+        if self._stats is None:
+            raise ValueError("No document was profiled.")
+
+        self._stats.dump_stats(path)
+
+    def save_slowest(self, directory):
+        """
+        Writes inputs of the slowest documents as
+        ``<directory>/<rank>_<name>/article.html`` so they can be replayed
+        as a corpus of `breadability.benchmarks`. Names and latencies are
+        written to ``<directory>/slowest.json``.
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        slowest = sorted(self._slowest, reverse=True)
+        index = []
+        for rank, (latency, _, name, html) in enumerate(slowest, 1):
+            document_directory = join(directory, "%03d_%s" % (
+                rank, re.sub(r"[^\w.-]+", "_", "%s" % name)[:64]))
+            if not os.path.isdir(document_directory):
+                os.makedirs(document_directory)
+            with open(join(document_directory, "article.html"), "wb") as file:
+                file.write(to_bytes(html))
+
+            index.append({
+                "name": "%s" % name,
+                "latency": latency,
+                "path": document_directory,
+            })
+
+        with open(join(directory, "slowest.json"), "w") as file:
+            file.write(json.dumps(index, indent=2) + "\n")
+
+    def _profile(self, function, html):
+        profile = cProfile.Profile()
+        result = profile.runcall(function, html)
+
+        self.profiled += 1
+        if self._stats is None:
+            self._stats = pstats.Stats(profile)
+        else:
+            self._stats.add(profile)
+
+        return result
+
+    def _keep(self, latency, name, html):
+        if self.keep_slowest <= 0:
+            return
+
+        item = (latency, self.documents, name, html)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, item)
+        elif latency > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
@@ -5,20 +5,38 @@ from __future__ import absolute_import
 import logging
 
 from copy import deepcopy
+from heapq import nlargest
 from operator import attrgetter
 from pprint import PrettyPrinter
 from lxml.html.clean import Cleaner
-from lxml.etree import tounicode, tostring
-from lxml.html import fragment_fromstring, fromstring
-
-from .document import OriginalDocument
-from .annotated_text import AnnotatedTextHandler
+from lxml.etree import Comment, ProcessingInstruction, tounicode
+from lxml.html import HtmlElement, fragment_fromstring, fromstring
+
+from ._compat import unicode_compatible
+from .document import OriginalDocument, get_tree_root, map_file
+from .annotated_text import (
+    AnnotatedTextHandler,
+    extract_text,
+    iter_text_paragraphs,
+)
+from .fingerprint import SimHash
+from .incremental import ExtractionState, fingerprint_subtrees
+from .instrumentation import (
+    OperationCounters,
+    call,
+    counted,
+    counting,
+)
+from .journal import IN_PLACE, Journal
+from .limits import LimitExceeded
 from .scoring import (
     get_class_weight,
     get_link_density,
     is_unlikely_node,
     score_candidates,
 )
+from .timing import NO_TIMER, StageTimer
+from .trace import Trace, trace_event, tracing
 from .utils import cached_property, shrink_text
 
 
@@ -29,6 +47,11 @@ html_cleaner = Cleaner(
     embedded=False, frames=False, forms=False,
     annoying_tags=False, remove_tags=None, kill_tags=("noscript", "iframe"),
     remove_unknown_tags=False, safe_attrs_only=False)
+# elements removed with their content by `html_cleaner`
+KILLED_TAGS = (
+    "script", "style", "link", "noscript", "iframe",
+    Comment, ProcessingInstruction,
+)
 
 
 SCORABLE_TAGS = ("div", "p", "td", "pre", "article")
@@ -49,6 +72,15 @@ NULL_DOCUMENT = """
 </html>
 """
 
+# outputs of `Article.extract` and properties they are stored in
+OUTPUTS = (
+    ("html_fragment", "readable"),
+    ("html_document", "readable_document"),
+    ("text", "text"),
+    ("annotated", "main_text"),
+    ("title", "title"),
+)
+
 logger = logging.getLogger("breadability")
 
 
@@ -56,7 +88,7 @@ def ok_embedded_video(node):
     """Check if this embed/video is an ok one to count."""
     good_keywords = ('youtube', 'blip.tv', 'vimeo')
 
-    node_str = tounicode(node)
+    node_str = call("tounicode", tounicode, node)
     for key in good_keywords:
         if key in node_str:
             return True
@@ -110,7 +142,56 @@ def document_from_fragment(fragment, return_fragment):
     return document
 
 
-def check_siblings(candidate_node, candidate_list):
+def copy_element(element):
+    """
+    Deep copy of the element. The copy is owned by a document with the
+    same doctype so it's serialized the same way as the element, e.g.
+    empty elements of XHTML documents.
+    """
+    copy = deepcopy(element)
+    doctype = element.getroottree().docinfo.doctype
+    if doctype:
+        holder = fromstring(doctype + "<html></html>")
+        holder.append(copy)
+        holder.remove(copy)
+
+    return copy
+
+
+def preclean_document(document, journal=IN_PLACE):
+    """
+    Does the part of `html_cleaner` cleaning the extraction depends on.
+    Elements are removed with their content, <image> is renamed and
+    links of named anchors (see `is_bad_link`) are cleaned. The rest
+    of the cleaning may be postponed to the readable copy.
+    """
+    # innermost elements first like `html_cleaner` does
+    for element in reversed(tuple(document.iter(*KILLED_TAGS))):
+        journal.drop_tree(element)
+
+    for element in document.iter("image"):
+        journal.retag(element, "img")
+
+    for element in document.iter("a"):
+        href = element.get("href")
+        if href and element.get("name"):
+            cleaned = clean_link(href)
+            if cleaned != href:
+                journal.set(element, "href", cleaned)
+
+    return document
+
+
+def clean_link(href):
+    """Returns the link as `html_cleaner` leaves it."""
+    anchor = fragment_fromstring("<a/>")
+    anchor.set("href", href)
+    html_cleaner(anchor)
+
+    return anchor.get("href")
+
+
+def check_siblings(candidate_node, candidate_list, journal=IN_PLACE):
     """
     Looks through siblings for content that might also be related.
     Things like preambles, content split by ads that we removed, etc.
@@ -120,13 +201,17 @@ def check_siblings(candidate_node, candidate_list):
     sibling_target_score = potential_target if potential_target > 10 else 10
     parent = candidate_node.node.getparent()
     siblings = parent.getchildren() if parent is not None else []
+    debug = logger.isEnabledFor(logging.DEBUG)
+    text_content = counted("text_content", HtmlElement.text_content)
 
     for sibling in siblings:
         append = False
+        reason = None
         content_bonus = 0
 
         if sibling is candidate_node.node:
             append = True
+            reason = "candidate"
 
         # Give a bonus if sibling nodes and top candidates have the example
         # same class name
@@ -139,70 +224,98 @@ def check_siblings(candidate_node, candidate_list):
 
             if adjusted_score >= sibling_target_score:
                 append = True
+                reason = reason or "score"
 
         if sibling.tag == "p":
             link_density = get_link_density(sibling)
-            content = sibling.text_content()
+            content = text_content(sibling)
             content_length = len(content)
 
             if content_length > 80 and link_density < 0.25:
                 append = True
+                reason = reason or "long_paragraph"
             elif content_length < 80 and link_density == 0:
                 if ". " in content:
                     append = True
+                    reason = reason or "short_paragraph"
 
+        trace_event(
+            "sibling", sibling, appended=append, reason=reason,
+            target=sibling_target_score)
         if append:
-            logger.debug(
-                "Sibling appended: %s %r", sibling.tag, sibling.attrib)
+            if debug:
+                logger.debug(
+                    "Sibling appended: %s %r", sibling.tag, sibling.attrib)
             if sibling.tag not in ("div", "p"):
                 # We have a node that isn't a common block level element, like
                 # a form or td tag. Turn it into a div so it doesn't get
                 # filtered out later by accident.
-                sibling.tag = "div"
+                journal.retag(sibling, "div")
 
             if candidate_node.node != sibling:
-                candidate_node.node.append(sibling)
+                journal.move(sibling, candidate_node.node)
 
     return candidate_node
 
 
-def clean_document(node):
-    """Cleans up the final document we return as the readable article."""
+def clean_document(node, budget=None, lite=False):
+    """
+    Cleans up the final document we return as the readable article.
+
+    :param budget: Optional `breadability.limits.Budget`. When its
+        deadline passes the cleaning is truncated and only the nodes
+        found so far are dropped.
+    :param bool lite: If True the conditional cleaning is skipped and
+        all embedded objects are dropped without inspection.
+    """
     if node is None or len(node) == 0:
         return None
 
-    logger.debug("\n\n-------------- CLEANING DOCUMENT -----------------")
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("\n\n-------------- CLEANING DOCUMENT -----------------")
     to_drop = []
+    text_content = counted("text_content", HtmlElement.text_content)
+
+    nodes = node.iter()
+    if budget is not None:
+        nodes = budget.until_deadline(nodes)
 
-    for n in node.iter():
+    for n in nodes:
         # clean out any in-line style properties
         if "style" in n.attrib:
             n.set("style", "")
 
         # remove embended objects unless it's wanted video
-        if n.tag in ("object", "embed") and not ok_embedded_video(n):
-            logger.debug("Dropping node %s %r", n.tag, n.attrib)
+        if n.tag in ("object", "embed") and (lite or not ok_embedded_video(n)):
+            if debug:
+                logger.debug("Dropping node %s %r", n.tag, n.attrib)
+            trace_event("drop", n, reason="embed")
             to_drop.append(n)
 
         # clean headings with bad css or high link density
         if n.tag in ("h1", "h2", "h3", "h4") and get_class_weight(n) < 0:
             logger.debug("Dropping <%s>, it's insignificant", n.tag)
+            trace_event("drop", n, reason="heading_class")
             to_drop.append(n)
 
         if n.tag in ("h3", "h4") and get_link_density(n) > 0.33:
             logger.debug("Dropping <%s>, it's insignificant", n.tag)
+            trace_event("drop", n, reason="heading_links")
             to_drop.append(n)
 
         # drop block element without content and children
         if n.tag in ("div", "p"):
-            text_content = shrink_text(n.text_content())
-            if len(text_content) < 5 and not n.getchildren():
-                logger.debug(
-                    "Dropping %s %r without content.", n.tag, n.attrib)
+            content = shrink_text(text_content(n))
+            if len(content) < 5 and not n.getchildren():
+                if debug:
+                    logger.debug(
+                        "Dropping %s %r without content.", n.tag, n.attrib)
+                trace_event("drop", n, reason="empty")
                 to_drop.append(n)
 
         # finally try out the conditional cleaning of the target node
-        if clean_conditionally(n):
+        if not lite and clean_conditionally(n):
             to_drop.append(n)
 
     drop_nodes_with_parents(to_drop)
@@ -210,18 +323,19 @@ def clean_document(node):
     return node
 
 
-def drop_nodes_with_parents(nodes):
+def drop_nodes_with_parents(nodes, journal=IN_PLACE):
     for node in nodes:
         if node.getparent() is None:
             continue
 
-        node.drop_tree()
-        logger.debug(
-            "Dropped node with parent %s %r %s",
-            node.tag,
-            node.attrib,
-            node.text_content()[:50]
-        )
+        journal.drop_tree(node)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Dropped node with parent %s %r %s",
+                node.tag,
+                node.attrib,
+                node.text_content()[:50]
+            )
 
 
 def clean_conditionally(node):
@@ -237,9 +351,13 @@ def clean_conditionally(node):
     if weight + content_score < 0:
         logger.debug('Dropping conditional node')
         logger.debug('Weight + score < 0')
+        trace_event("drop", node, reason="negative_weight")
         return True
 
-    commas_count = node.text_content().count(',')
+    text_content = counted("text_content", HtmlElement.text_content)
+    findall = counted("findall", HtmlElement.findall)
+
+    commas_count = text_content(node).count(',')
     if commas_count < 10:
         logger.debug(
             "There are %d commas so we're processing more.", commas_count)
@@ -247,50 +365,54 @@ def clean_conditionally(node):
         # If there are not very many commas, and the number of
         # non-paragraph elements is more than paragraphs or other ominous
         # signs, remove the element.
-        p = len(node.findall('.//p'))
-        img = len(node.findall('.//img'))
-        li = len(node.findall('.//li')) - 100
-        inputs = len(node.findall('.//input'))
+        p = len(findall(node, './/p'))
+        img = len(findall(node, './/img'))
+        li = len(findall(node, './/li')) - 100
+        inputs = len(findall(node, './/input'))
 
         embed = 0
-        embeds = node.findall('.//embed')
+        embeds = findall(node, './/embed')
         for e in embeds:
             if ok_embedded_video(e):
                 embed += 1
         link_density = get_link_density(node)
-        content_length = len(node.text_content())
+        content_length = len(text_content(node))
 
-        remove_node = False
+        reason = None
 
         if li > p and node.tag != 'ul' and node.tag != 'ol':
             logger.debug('Conditional drop: li > p and not ul/ol')
-            remove_node = True
+            reason = "list_items"
         elif inputs > p / 3.0:
             logger.debug('Conditional drop: inputs > p/3.0')
-            remove_node = True
+            reason = "inputs"
         elif content_length < 25 and (img == 0 or img > 2):
             logger.debug('Conditional drop: len < 25 and 0/>2 images')
-            remove_node = True
+            reason = "images"
         elif weight < 25 and link_density > 0.2:
             logger.debug('Conditional drop: weight small (%f) and link is dense (%f)', weight, link_density)
-            remove_node = True
+            reason = "link_density"
         elif weight >= 25 and link_density > 0.5:
             logger.debug('Conditional drop: weight big but link heavy')
-            remove_node = True
+            reason = "link_heavy"
         elif (embed == 1 and content_length < 75) or embed > 1:
             logger.debug(
                 'Conditional drop: embed w/o much content or many embed')
-            remove_node = True
+            reason = "embeds"
+
+        if reason is None:
+            return False
 
-        if remove_node:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug('Node will be removed: %s %r %s', node.tag, node.attrib, node.text_content()[:30])
+        trace_event("drop", node, reason=reason)
 
-        return remove_node
+        return True
 
     return False  # nope, don't remove anything
 
 
-def prep_article(doc):
+def prep_article(doc, budget=None, lite=False):
     """Once we've found our target article we want to clean it up.
 
     Clean out:
@@ -299,32 +421,65 @@ def prep_article(doc):
     - strip empty <p>
     - extra tags
     """
-    return clean_document(doc)
+    return clean_document(doc, budget, lite)
 
 
-def find_candidates(document):
+def find_candidates(document, budget=None, lite=False, known_scores=None,
+                    timer=NO_TIMER):
     """
     Finds cadidate nodes for the readable version of the article.
 
     Here's we're going to remove unlikely nodes, find scores on the rest,
     clean up and return the final best match.
+
+    :param budget: Optional `breadability.limits.Budget` every visited
+        node is accounted to. Raises `LimitExceeded` when it's spent.
+    :param bool lite: Use the cheaper scoring without adjustment
+        by link density.
+    :param dict known_scores: Optional mapping of candidate nodes to
+        their scores known from the previous extraction. Score of a
+        candidate depends only on its subtree so nodes contributing
+        only to known candidates are not scored again.
+    :param timer: `breadability.timing.StageTimer` measuring the scoring.
     """
     nodes_to_score = set()
     should_remove = set()
+    debug = logger.isEnabledFor(logging.DEBUG)
 
     for node in document.iter():
+        if budget is not None:
+            budget.visit(node)
+
         if is_unlikely_node(node):
-            logger.debug(
-                "We should drop unlikely: %s %r", node.tag, node.attrib)
+            if debug:
+                logger.debug(
+                    "We should drop unlikely: %s %r", node.tag, node.attrib)
+            trace_event("drop", node, reason="unlikely")
             should_remove.add(node)
         elif is_bad_link(node):
-            logger.debug(
-                "We should drop bad link: %s %r", node.tag, node.attrib)
+            if debug:
+                logger.debug(
+                    "We should drop bad link: %s %r", node.tag, node.attrib)
+            trace_event("drop", node, reason="bad_link")
             should_remove.add(node)
         elif node.tag in SCORABLE_TAGS:
             nodes_to_score.add(node)
 
-    return score_candidates(nodes_to_score), should_remove
+    if known_scores:
+        nodes_to_score = set(
+            n for n in nodes_to_score if not _is_known(n, known_scores))
+
+    with timer.measure("score_candidates"):
+        candidates = score_candidates(
+            nodes_to_score, budget, lite, known_scores)
+    return candidates, should_remove
+
+
+def _is_known(node, known_scores):
+    # the node contributes to its parent and grand parent
+    parent = node.getparent()
+    grand = None if parent is None else parent.getparent()
+    return grand in known_scores
 
 
 def is_bad_link(node):
@@ -350,98 +505,638 @@ def is_bad_link(node):
     return False
 
 
+def remove_orphans(dom):
+    """Drops elements wrapping only a single element of the same tag."""
+    for node in dom.iterdescendants():
+        if len(node) == 1 and tuple(node)[0].tag == node.tag:
+            node.drop_tag()
+
+    return dom
+
+
+@unicode_compatible
+class Alternative(object):
+    """
+    Candidate for the readable article copied out of the document.
+    It's cleaned when its output is accessed the first time.
+    """
+
+    def __init__(self, score, node, budget=None, lite=False,
+                 return_fragment=True):
+        """
+        :param float score: Score of the candidate.
+        :param node: Copy of the candidate with its related siblings.
+        :param budget: Optional `breadability.limits.Budget` of the
+            article spent by the cleaning.
+        :param bool lite: Clean the candidate in the lite mode.
+        :param return_fragment: Should we return a <div> fragment or
+            a full <html> document.
+        """
+        self.score = score
+        self._node = node
+        self._budget = budget
+        self._lite = lite
+        self._return_fragment = return_fragment
+
+    def __unicode__(self):
+        return self.readable
+
+    @cached_property
+    def readable_dom(self):
+        node = prep_article(self._node, self._budget, self._lite)
+        self._node = None
+
+        if node is None:
+            dom = build_error_document(None, self._return_fragment)
+        else:
+            dom = build_base_document(node, self._return_fragment)
+
+        return remove_orphans(dom.get_element_by_id("readabilityBody"))
+
+    @cached_property
+    def readable(self):
+        return tounicode(self.readable_dom)
+
+    @cached_property
+    def text(self):
+        """Plain text of the alternative, see `Article.text`."""
+        return extract_text(self.readable_dom)
+
+    def __repr__(self):
+        return "<Alternative with score %0.1f>" % self.score
+
+
+@unicode_compatible
 class Article(object):
     """Parsed readable object"""
 
-    def __init__(self, html, url=None, return_fragment=True):
+    def __init__(self, html, url=None, return_fragment=True, limits=None,
+                 lite=False, mutate_input=False, previous=None,
+                 incremental=False, timings=False, on_stage=None,
+                 count_operations=False, trace=False, metrics=None):
         """
         Create the Article we're going to use.
 
-        :param html: The string of HTML we're going to parse.
+        :param html: The string of HTML we're going to parse. Any
+            bytes-like object (e.g. memory mapped file) or a tree
+            already parsed by `lxml.html` is accepted too.
         :param url: The url so we can adjust the links to still work.
         :param return_fragment: Should we return a <div> fragment or
             a full <html> document.
+        :param limits: Optional `breadability.limits.Limits` bounding
+            the work spent on the document. When some limit is hit
+            the processing is truncated or falls back to the whole
+            body of the document. See `limit_exceeded`. The rest of
+            the processing is switched to the lite mode then.
+        :param bool lite: Trade quality of the extraction for speed.
+            The lite mode skips the conditional cleaning, merging of
+            the winner's siblings and inspection of embedded objects.
+            It also scores candidates without link density.
+        :param bool mutate_input: Process the given lxml tree in place
+            and leave it modified. Otherwise changes of the tree are
+            recorded and reverted once the readable tree is copied
+            out of it (see `readable_dom` and `release`). Only the
+            readable part of the tree is copied then.
+        :param previous: Optional `breadability.incremental.ExtractionState`
+            of the previous version of the page. Only the changed parts
+            of the page are scored and `readable` is returned from it if
+            the article is unchanged. See `unchanged`. The state is
+            reused only for the same kind of input (string or tree).
+        :param bool incremental: Keep fingerprints of the scored tree for
+            `extraction_state`. It's implied by `previous`.
+        :param bool timings: Measure stages of the processing, see
+            `timings`.
+        :param on_stage: Optional callable ``on_stage(stage, wall, cpu)``
+            called after every measured stage. It implies `timings`.
+        :param bool count_operations: Count calls of the expensive
+            primitives, see `operations`.
+        :param bool trace: Record scores of candidates, dropped nodes
+            and decisions about siblings, see `trace`.
+        :param metrics: Optional `breadability.metrics.ExtractionMetrics`
+            updated by the processing. It implies `timings`.
         """
-        self._original_document = OriginalDocument(html, url=url)
+        self._metrics = metrics
+        self._counted = False
+        if metrics is not None and get_tree_root(html) is None:
+            metrics.input_size.observe(len(html))
+
+        self._budget = None
+        if limits is not None:
+            self._budget = limits.budget()
+            if get_tree_root(html) is None:
+                html = self._budget.truncate(html)
+
+        if metrics is not None:
+            on_stage = _chain_callbacks(metrics.observe_stage, on_stage)
+
+        self._timer = NO_TIMER
+        if timings or on_stage is not None:
+            self._timer = StageTimer(on_stage)
+        self._counters = OperationCounters() if count_operations else None
+        self._trace = Trace() if trace else None
+
+        journal = None
+        self._journal = IN_PLACE
+        if get_tree_root(html) is not None and not mutate_input:
+            journal = self._journal = Journal()
+
+        self._original_document = OriginalDocument(html, url=url,
+            mutate_input=mutate_input, journal=journal, timer=self._timer)
+        self._url = url
         self._return_fragment = return_fragment
-
-    def __str__(self):
-        return tostring(self._readable())
+        self._lite = lite
+        self._previous = previous
+        self._incremental = incremental or previous is not None
+        self._fingerprints = None
+        self._fallen_back = False
+        # limit which stopped the scoring of candidates
+        self._scoring_limit = None
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        """
+        Creates article from HTML file. The file is memory mapped so
+        it's read lazily and only the decoded text is kept in memory.
+        Keyword arguments are passed to the constructor.
+        """
+        return cls(map_file(path), **kwargs)
 
     def __unicode__(self):
-        return tounicode(self._readable())
+        """Renders the readable article, see `readable`."""
+        return self.readable
+
+    @property
+    def limit_exceeded(self):
+        """
+        Name of the first limit hit during processing ("max_bytes",
+        "max_elements", "max_depth" or "timeout") or ``None``.
+        """
+        if self._budget is None:
+            return None
+
+        return self._budget.exceeded
+
+    @property
+    def timings(self):
+        """
+        Wall and CPU time in seconds spent in the stages of the processing
+        as a mapping of names of the stages to pairs ``(wall, cpu)`` or
+        ``None`` if the article isn't measured. Stages are named by the
+        functions doing them. Only stages done so far are included and
+        "score_candidates" is included in "find_candidates".
+        """
+        if not self._timer.recording:
+            return None
+
+        return self._timer.timings
+
+    @property
+    def operations(self):
+        """
+        Calls of the expensive primitives during scoring and cleaning of
+        the article as a mapping of their names ("text_content", "findall",
+        "search", "tounicode" and "drop_tree") to pairs ``(calls, time)``
+        or ``None`` if operations are not counted.
+        """
+        if self._counters is None:
+            return None
+
+        return self._counters.operations
+
+    @property
+    def trace(self):
+        """
+        `breadability.trace.Trace` with events of scoring and cleaning
+        of the article or ``None`` if the article isn't traced. Events
+        are "candidate" with the final score of every candidate, "drop"
+        with the reason of every dropped node, "sibling" with decision
+        about every sibling of the winner, "winner" and "fallback" when
+        no winner is used.
+        """
+        return self._trace
+
+    @property
+    def lite(self):
+        """True if the document is processed in the lite mode."""
+        return self._lite or self.limit_exceeded is not None
 
     @cached_property
     def dom(self):
-        """Parsed lxml tree (Document Object Model) of the given html."""
+        """
+        Parsed lxml tree (Document Object Model) of the given html.
+        The given lxml tree is used directly if it's processed by the
+        journal so it's reverted once the candidates are found.
+        """
+        if self._original_document is None:
+            raise RuntimeError(
+                "Article was released before the output was computed.")
+
+        timer = self._timer
         try:
             dom = self._original_document.dom
-            # cleaning doesn't return, just wipes in place
-            html_cleaner(dom)
-            return leaf_div_elements_into_paragraphs(dom)
+            if self._journal.recording:
+                # the rest of cleaning is done on the readable copy
+                with timer.measure("preclean_document"):
+                    preclean_document(dom, self._journal)
+            else:
+                # cleaning doesn't return, just wipes in place
+                with timer.measure("html_cleaner"):
+                    html_cleaner(dom)
+            with timer.measure("leaf_div_elements_into_paragraphs"):
+                return leaf_div_elements_into_paragraphs(
+                    dom, self._budget, self._journal)
         except ValueError:
             return None
 
     @cached_property
     def candidates(self):
-        """Generates list of candidates from the DOM."""
+        """
+        Generates list of candidates from the DOM. The given lxml tree
+        is reverted once they're found, the changes are applied again
+        when the readable tree is built.
+        """
+        try:
+            return self._find_candidates()
+        finally:
+            self._journal.rollback()
+
+    def _find_candidates(self):
         dom = self.dom
         if dom is None or len(dom) == 0:
             return None
 
-        candidates, unlikely_candidates = find_candidates(dom)
-        drop_nodes_with_parents(unlikely_candidates)
+        known_scores = None
+        if self._incremental:
+            # fingerprints of the tree as it's scored
+            with self._timer.measure("fingerprint_subtrees"):
+                self._fingerprints = fingerprint_subtrees(dom)
+            known_scores = self._get_known_scores()
+
+        with counting(self._counters), tracing(self._trace):
+            try:
+                with self._timer.measure("find_candidates"):
+                    candidates, unlikely_candidates = find_candidates(
+                        dom, self._budget, self.lite, known_scores,
+                        self._timer)
+            except LimitExceeded as e:
+                logger.info("Scoring of candidates stopped: %s", e)
+                self._scoring_limit = e.limit
+                self._fallback("limit_exceeded")
+                return None
+
+            drop_nodes_with_parents(unlikely_candidates, self._journal)
+
+        if known_scores is not None and self._metrics is not None:
+            self._metrics.cache_lookup(
+                "scores", len(known_scores),
+                len(candidates) - len(known_scores))
+
+        if self._trace is not None:
+            for candidate in sorted(candidates.values(),
+                    key=attrgetter("content_score"), reverse=True):
+                self._trace.record(
+                    "candidate", candidate.node,
+                    score=candidate.content_score)
 
         return candidates
 
     @cached_property
     def main_text(self):
-        dom = deepcopy(self.readable_dom).get_element_by_id("readabilityBody")
-        return AnnotatedTextHandler.parse(dom)
+        readable_dom = self.readable_dom
+        with self._timer.measure("annotate"):
+            return AnnotatedTextHandler.parse(readable_dom)
+
+    def iter_main_text(self):
+        """
+        Yields paragraphs of `main_text` one by one as soon as they're
+        converted. Nothing is cached.
+        """
+        return AnnotatedTextHandler.iter_paragraphs(self.readable_dom)
+
+    @cached_property
+    def text(self):
+        """
+        Plain text of the readable article. It's much cheaper than
+        `main_text` or `readable` when only the text is needed.
+        """
+        readable_dom = self.readable_dom
+        with self._timer.measure("extract_text"):
+            return extract_text(readable_dom)
+
+    @cached_property
+    def fingerprint(self):
+        """
+        SimHash of the `text` for detection of near-duplicate articles,
+        see `breadability.fingerprint`. It's computed during the same
+        walk as the `text` unless the text is known already. It's
+        ``None`` if the article has no text.
+        """
+        hasher = SimHash()
+        if hasattr(self, "_cached_property_text"):
+            hasher.update(self.text)
+            return hasher.digest()
+
+        paragraphs = []
+        for paragraph in iter_text_paragraphs(self.readable_dom):
+            hasher.update(paragraph)
+            paragraphs.append(paragraph)
+
+        self._cached_property_text = "\n\n".join(paragraphs)
+        return hasher.digest()
 
     @cached_property
     def readable(self):
-        return tounicode(self.readable_dom)
+        if self.unchanged:
+            # the given tree is not needed for the readable tree
+            self._journal.rollback()
+            self._count_document()
+            return self._previous.readable
+
+        readable_dom = self.readable_dom
+        with self._timer.measure("serialize"):
+            return tounicode(readable_dom)
+
+    @cached_property
+    def unchanged(self):
+        """
+        True if the winning candidate and its siblings are the same
+        as in the `previous` version of the page. Then the `readable`
+        is taken from the previous version without any cleaning.
+        """
+        previous = self._get_previous()
+        if previous is None or not self.candidates:
+            return False
+
+        winner, = self._best_candidates(1)
+        parent = self._get_scored_parent(winner.node)
+        unchanged = (
+            self._fingerprints[winner.node] == previous.winner and
+            self._fingerprints.get(parent) == previous.winner_parent
+        )
+        if self._metrics is not None:
+            self._metrics.cache_lookup(
+                "readable", int(unchanged), int(not unchanged))
+
+        return unchanged
+
+    @cached_property
+    def extraction_state(self):
+        """
+        `breadability.incremental.ExtractionState` to be passed as
+        `previous` to the article of the next version of the page. It's
+        ``None`` if the article isn't processed incrementally, if no
+        candidate was found, if the readable article wasn't built from
+        the winning candidate or if some limit was hit.
+        """
+        if not self._incremental or not self.candidates:
+            return None
+
+        readable = self.readable
+        if self.limit_exceeded is not None or self._fallen_back:
+            # the readable article depends on more than the winner
+            return None
+
+        fingerprints = self._fingerprints
+        winner, = self._best_candidates(1)
+        scores = dict(
+            (fingerprints[node], candidate.content_score)
+            for node, candidate in self.candidates.items()
+        )
+
+        return ExtractionState(
+            scores, fingerprints[winner.node],
+            fingerprints.get(self._get_scored_parent(winner.node)), readable,
+            self._get_options())
+
+    @cached_property
+    def readable_document(self):
+        """Readable article as a full HTML document."""
+        dom = self.readable_dom
+        body = dom.getparent()
+        head = dom.getroottree().getroot().find("head")
+        if body is None or body.tag != "body" or head is None:
+            # readable <div> is moved, nothing is copied
+            document_from_fragment(dom, return_fragment=False)
+
+        return tounicode(dom.getroottree(), doctype="<!DOCTYPE html>")
+
+    @cached_property
+    def title(self):
+        """Title of the original document."""
+        if self._original_document is None:
+            raise RuntimeError(
+                "Article was released before the title was computed.")
+
+        return self._original_document.title
+
+    @cached_property
+    def metadata(self):
+        """
+        `breadability.document.Metadata` of the original document.
+        Only the head of the document is parsed unless the document
+        is processed already.
+        """
+        if self._original_document is None:
+            raise RuntimeError(
+                "Article was released before the metadata were computed.")
+
+        return self._original_document.metadata
+
+    def alternatives(self, n=3):
+        """
+        Returns up to `n` best candidates for the readable article as
+        `Alternative` instances ordered by their score. The first one is
+        the winning candidate `readable` is built from. If the winner
+        is cleaned out entirely, `readable` falls back to the whole
+        document but the first alternative is the error document. All of
+        them come from the single scoring of the document and each one
+        is cleaned only when its output is accessed.
+        """
+        if not self.candidates:
+            return []
+
+        # the given tree is reverted once the readable tree is built
+        replayed = self._journal.replay()
+        try:
+            return [
+                Alternative(
+                    candidate.content_score, self._copy_candidate(candidate),
+                    self._budget, self.lite, self._return_fragment)
+                for candidate in self._best_candidates(n)
+            ]
+        finally:
+            if replayed:
+                self._journal.rollback()
+
+    def extract(self, outputs=tuple(name for name, _ in OUTPUTS),
+                release=False):
+        """
+        Returns several outputs of the article at once. All of them
+        are computed from the single extraction.
+
+        :param outputs: Names of outputs. Possible are "html_fragment"
+            (`readable`), "html_document" (`readable_document`), "text"
+            (`text`), "annotated" (`main_text`) and "title" (`title`).
+        :param bool release: Call `release` once the outputs
+            are computed.
+        :returns dict: Mapping of output names to their values.
+        """
+        properties = dict(OUTPUTS)
+        unknown = [name for name in outputs if name not in properties]
+        if unknown:
+            raise ValueError("Unknown outputs: %s" % ", ".join(unknown))
+
+        result = dict(
+            (name, getattr(self, properties[name])) for name in outputs)
+        if release:
+            self.release()
+
+        return result
+
+    def release(self):
+        """
+        Frees the input, the original tree, candidates and all the other
+        intermediate state. Outputs computed before stay available and
+        the readable tree is copied so it doesn't keep the original
+        tree alive. Outputs derived from the readable tree can be still
+        computed if it was computed before release. Other outputs raise
+        `RuntimeError` then.
+        """
+        if hasattr(self, "_cached_property_readable_dom"):
+            self._cached_property_readable_dom = deepcopy(self.readable_dom)
+
+        for name in ("dom", "candidates"):
+            key = "_cached_property_" + name
+            if hasattr(self, key):
+                delattr(self, key)
+
+        self._fingerprints = None
+        self._previous = None
+
+        if self._budget is not None:
+            self._budget.release()
+
+        self._journal.rollback()
+        self._original_document = None
 
     @cached_property
     def readable_dom(self):
-        return self._readable()
+        try:
+            # the given tree is reverted after scoring, see `candidates`
+            self.candidates
+            self._journal.replay()
+            with counting(self._counters), tracing(self._trace):
+                dom = self._readable()
+        except Exception as e:
+            if self._metrics is not None:
+                self._metrics.failures.inc(exception=type(e).__name__)
+            raise
+        finally:
+            # the readable tree is copied out of the given tree by now
+            self._journal.rollback()
+
+        self._count_document()
+        return dom
+
+    def _get_options(self):
+        return self.lite, self._return_fragment, self._url
+
+    def _get_previous(self):
+        """Returns the previous extraction state if it can be used."""
+        previous = self._previous
+        if previous is not None and previous.options != self._get_options():
+            logger.info("Ignoring extraction state with different options.")
+            return None
+
+        return previous
+
+    def _get_known_scores(self):
+        previous = self._get_previous()
+        if previous is None:
+            return None
+
+        scores = previous.scores
+        return dict(
+            (node, scores[fingerprint])
+            for node, fingerprint in self._fingerprints.items()
+            if fingerprint in scores
+        )
 
     def _readable(self):
         """The readable parsed article"""
         if not self.candidates:
             logger.info("No candidates found in document.")
+            self._fallback("no_candidates")
             return self._handle_no_candidates()
 
-        # right now we return the highest scoring candidate content
-        best_candidates = sorted(
-            (c for c in self.candidates.values()),
-            key=attrgetter("content_score"), reverse=True)
-
-        printer = PrettyPrinter(indent=2)
-        logger.debug(printer.pformat(best_candidates))
+        if logger.isEnabledFor(logging.DEBUG):
+            printer = PrettyPrinter(indent=2)
+            logger.debug(printer.pformat(
+                self._best_candidates(len(self.candidates))))
 
-        # since we have several candidates, check the winner's siblings
-        # for extra content
-        winner = best_candidates[0]
-        updated_winner = check_siblings(winner, self.candidates)
-        updated_winner.node = prep_article(updated_winner.node)
-        if updated_winner.node is not None:
-            dom = build_base_document(
-                updated_winner.node, self._return_fragment)
+        # right now we return the highest scoring candidate content
+        winner, = self._best_candidates(1)
+        trace_event("winner", winner.node, score=winner.content_score)
+        node = self._copy_candidate(winner)
+        with self._timer.measure("prep_article"):
+            node = prep_article(node, self._budget, self.lite)
+        if node is not None:
+            dom = build_base_document(node, self._return_fragment)
         else:
             logger.info(
                 'Had candidates but failed to find a cleaned winning DOM.')
+            self._fallback("empty_winner")
             dom = self._handle_no_candidates()
 
-        return self._remove_orphans(dom.get_element_by_id("readabilityBody"))
+        with self._timer.measure("remove_orphans"):
+            return remove_orphans(dom.get_element_by_id("readabilityBody"))
+
+    def _get_scored_parent(self, node):
+        """Returns parent of the node in the tree as it was scored."""
+        replayed = self._journal.replay()
+        try:
+            return node.getparent()
+        finally:
+            if replayed:
+                self._journal.rollback()
 
-    def _remove_orphans(self, dom):
-        for node in dom.iterdescendants():
-            if len(node) == 1 and tuple(node)[0].tag == node.tag:
-                node.drop_tag()
+    def _best_candidates(self, n):
+        """Returns `n` candidates with the highest score, the best first."""
+        return nlargest(
+            n, self.candidates.values(), key=attrgetter("content_score"))
 
-        return dom
+    def _copy_candidate(self, candidate):
+        """
+        Copies the candidate with its related siblings out of the tree.
+        The tree is left as it was scored so other candidates can be
+        copied from it too.
+        """
+        journal = Journal()
+        # since we have several candidates, check the candidate's siblings
+        # for extra content
+        if not self.lite:
+            with self._timer.measure("check_siblings"):
+                candidate = check_siblings(
+                    candidate, self.candidates, journal)
+
+        try:
+            return self._detach(candidate.node, copy=True)
+        finally:
+            journal.rollback()
+
+    def _detach(self, node, copy=False):
+        """
+        Returns copy of the node with the postponed cleaning done if the
+        given tree is processed by the journal. Otherwise the node itself
+        is returned unless `copy` is True.
+        """
+        if not self._journal.recording:
+            return copy_element(node) if copy else node
+
+        node = self._original_document.resolve_links(copy_element(node))
+        with self._timer.measure("html_cleaner"):
+            html_cleaner(node)
+        return node
 
     def _handle_no_candidates(self):
         """
@@ -449,28 +1144,78 @@ class Article(object):
         """
         # since we've not found a good candidate we're should help this
         if self.dom is not None and len(self.dom):
-            dom = prep_article(self.dom)
+            dom = self.dom
+            if self._scoring_limit in ("max_elements", "max_depth"):
+                # only the part of the document within the limits is used
+                dom = self._copy_within_limits(dom)
+            dom = self._detach(dom)
+            with self._timer.measure("prep_article"):
+                dom = prep_article(dom, self._budget, self.lite)
             dom = build_base_document(dom, self._return_fragment)
-            return self._remove_orphans(
-                dom.get_element_by_id("readabilityBody"))
+            with self._timer.measure("remove_orphans"):
+                return remove_orphans(
+                    dom.get_element_by_id("readabilityBody"))
         else:
             logger.info("No document to use.")
+            self._fallback("error_document")
             return build_error_document(self._return_fragment)
 
+    def _copy_within_limits(self, dom):
+        """Returns copy of the body of the document within the limits."""
+        body = dom.find("body")
+        if body is None:
+            return self._budget.copy_within(dom)
+
+        root = dom.makeelement("html", {})
+        root.append(self._budget.copy_within(body))
+        return root
+
+    def _count_document(self):
+        if self._metrics is not None and not self._counted:
+            self._metrics.documents.inc()
+            self._counted = True
+
+    def _fallback(self, reason):
+        self._fallen_back = True
+        trace_event("fallback", reason=reason)
+        if self._metrics is not None:
+            self._metrics.fallbacks.inc(reason=reason)
+
 
-def leaf_div_elements_into_paragraphs(document):
+def _chain_callbacks(*callbacks):
+    """Returns callback calling all the given callbacks except ``None``."""
+    callbacks = [c for c in callbacks if c is not None]
+
+    def chained(*args):
+        for callback in callbacks:
+            callback(*args)
+
+    return chained
+
+
+def leaf_div_elements_into_paragraphs(document, budget=None,
+                                      journal=IN_PLACE):
     """
     Turn some block elements that don't have children block level
     elements into <p> elements.
 
     Since we can't change the tree as we iterate over it, we must do this
     before we process our document.
+
+    :param budget: Optional `breadability.limits.Budget`. When its
+        deadline passes the rest of elements is left untouched.
+    :param journal: `breadability.journal.Journal` the changes
+        are done by.
     """
-    for element in document.iter(tag="div"):
+    elements = document.iter(tag="div")
+    if budget is not None:
+        elements = budget.until_deadline(elements)
+
+    for element in elements:
         child_tags = tuple(n.tag for n in element.getchildren())
         if "div" not in child_tags and "p" not in child_tags:
             logger.debug(
                 "Changing leaf block element <%s> into <p>", element.tag)
-            element.tag = "p"
+            journal.retag(element, "p")
 
     return document
@@ -10,7 +10,9 @@ import logging
 
 from hashlib import md5
 from lxml.etree import tostring
+from lxml.html import HtmlElement
 from ._compat import to_bytes
+from .instrumentation import counted
 from .utils import normalize_whitespace
 
 
@@ -45,9 +47,10 @@ def check_node_attributes(pattern, node, *attributes):
     Searches match in attributes against given pattern and if
     finds the match against any of them returns True.
     """
+    search = counted("search", pattern.search)
     for attribute_name in attributes:
         attribute = node.get(attribute_name)
-        if attribute is not None and pattern.search(attribute):
+        if attribute is not None and search(attribute):
             return True
 
     return False
@@ -83,25 +86,30 @@ def get_link_density(node, node_text=None):
         Returns value of computed 0 <= density <= 1, where 0 means
         no links and 1 means that node contains only links.
     """
+    text_content = counted("text_content", HtmlElement.text_content)
+    findall = counted("findall", HtmlElement.findall)
+
     if node_text is None:
-        node_text = node.text_content()
+        node_text = text_content(node)
     node_text = normalize_whitespace(node_text.strip())
 
     text_length = len(node_text)
     if text_length == 0:
         return 0.0
 
-    links_length = sum(map(_get_normalized_text_length, node.findall(".//a")))
+    links_length = sum(
+        _get_normalized_text_length(text_content(link))
+        for link in findall(node, ".//a"))
     # Give 50 bonus chars worth of length for each img.
     # Tweaking this 50 down a notch should help if we hit false positives.
-    img_bonuses = 50 * len(node.findall(".//img"))
+    img_bonuses = 50 * len(findall(node, ".//img"))
     links_length = max(0, links_length - img_bonuses)
 
     return links_length / text_length
 
 
-def _get_normalized_text_length(node):
-    return len(normalize_whitespace(node.text_content().strip()))
+def _get_normalized_text_length(text):
+    return len(normalize_whitespace(text.strip()))
 
 
 def get_class_weight(node):
@@ -138,13 +146,30 @@ def is_unlikely_node(node):
     return bool(unlikely and not maybe and node.tag != "body")
 
 
-def score_candidates(nodes):
-    """Given a list of potential nodes, find some initial scores to start"""
+def score_candidates(nodes, budget=None, lite=False, known_scores=None):
+    """
+    Given a list of potential nodes, find some initial scores to start
+
+    :param budget: Optional `breadability.limits.Budget` checked while
+        scoring. It raises `LimitExceeded` when the deadline passes.
+    :param bool lite: If True scores are not adjusted by link density
+        of candidates which needs text of every candidate and its links.
+    :param dict known_scores: Optional mapping of candidate nodes to
+        their final scores known already. They are used instead of
+        the scores computed from the given nodes.
+    """
     MIN_HIT_LENTH = 25
     candidates = {}
+    # arguments of some messages are expensive, e.g. attributes of nodes
+    debug = logger.isEnabledFor(logging.DEBUG)
+    text_content = counted("text_content", HtmlElement.text_content)
 
     for node in nodes:
-        logger.debug("* Scoring candidate %s %r", node.tag, node.attrib)
+        if budget is not None:
+            budget.check_time()
+
+        if debug:
+            logger.debug("* Scoring candidate %s %r", node.tag, node.attrib)
 
         # if the node has no parent it knows of then it ends up creating a
         # body & html tag to parent the html fragment
@@ -159,7 +184,7 @@ def score_candidates(nodes):
             continue
 
         # if paragraph is < `MIN_HIT_LENTH` characters don't even count it
-        inner_text = node.text_content().strip()
+        inner_text = text_content(node).strip()
         if len(inner_text) < MIN_HIT_LENTH:
             logger.debug(
                 "Skipping candidate - inner text < %d characters.",
@@ -196,28 +221,44 @@ def score_candidates(nodes):
             logger.debug("Bonus points for length of text: %f", length_points)
 
         # add the score to the parent
-        logger.debug(
-            "Bonus points for parent %s %r with score %f: %f",
-            parent.tag, parent.attrib, candidates[parent].content_score,
-            content_score)
+        if debug:
+            logger.debug(
+                "Bonus points for parent %s %r with score %f: %f",
+                parent.tag, parent.attrib, candidates[parent].content_score,
+                content_score)
         candidates[parent].content_score += content_score
         # the grand node gets half
-        logger.debug(
-            "Bonus points for grand %s %r with score %f: %f",
-            grand.tag, grand.attrib, candidates[grand].content_score,
-            content_score / 2.0)
+        if debug:
+            logger.debug(
+                "Bonus points for grand %s %r with score %f: %f",
+                grand.tag, grand.attrib, candidates[grand].content_score,
+                content_score / 2.0)
         candidates[grand].content_score += content_score / 2.0
 
         if node not in candidates:
             candidates[node] = ScoredNode(node)
         candidates[node].content_score += content_score
 
+    known_scores = known_scores or {}
+    for node, content_score in known_scores.items():
+        candidates[node] = ScoredNode(node)
+        candidates[node].content_score = content_score
+
+    if lite:
+        return candidates
+
     for candidate in candidates.values():
+        if candidate.node in known_scores:
+            continue
+        if budget is not None:
+            budget.check_time()
+
         adjustment = 1.0 - get_link_density(candidate.node)
         candidate.content_score *= adjustment
-        logger.debug(
-            "Link density adjustment for %s %r: %f",
-            candidate.node.tag, candidate.node.attrib, adjustment)
+        if debug:
+            logger.debug(
+                "Link density adjustment for %s %r: %f",
+                candidate.node.tag, candidate.node.attrib, adjustment)
 
     return candidates
 
@@ -261,3 +302,4 @@ class ScoredNode(object):
             self.node.attrib,
             self.content_score
         )
+
@@ -0,0 +1,341 @@
+# -*- coding: utf8 -*-
+
+"""
+Benchmarks of breadability over a corpus of articles stored
+as <corpus>/<name>/article.html. The test articles are used by default.
+Commands fail with status 2 if the corpus has no article.
+
+Usage:
+    breadability_bench lite [options] [<corpus>]
+    breadability_bench corpus [options] [--json=<file>] [<corpus>]
+    breadability_bench helpers [options] [--json=<file>] [<corpus>]
+    breadability_bench scaling [options] [--json=<file>]
+                               [--parameter=<name>] [--values=<list>]
+                               [--threshold=<k>]
+    breadability_bench memory [options] [--json=<file>]
+                              [--synthetic=<list>] [<corpus>]
+    breadability_bench baseline [options] [--output=<file>] [<corpus>]
+    breadability_bench check [options] [--baseline=<file>]
+                             [--max-regression=<r>] [<corpus>]
+    breadability_bench profile [options] [--every=<n>]
+                               [--slower-than=<ms>] [--slowest=<n>]
+                               [--save=<dir>] [--stats=<file>] [<corpus>]
+    breadability_bench --version
+    breadability_bench --help
+
+Commands:
+  lite                    Compare speed and quality of the lite mode
+                          against the full extraction.
+  corpus                  Measure throughput and latency percentiles
+                          of the readable article, annotated text and
+                          title over the corpus.
+  helpers                 Measure the hot helpers one by one on samples
+                          collected from the corpus.
+  scaling                 Measure the stages of the extraction over
+                          synthetic pages growing in one parameter and
+                          flag stages growing super-linearly. Exits
+                          with status 1 if some stage is flagged.
+  memory                  Measure peak and retained memory of the stages
+                          of the extraction of every document of the
+                          corpus and of large synthetic pages.
+  baseline                Record timings and memory of the extraction
+                          with the speed of this machine as a baseline.
+  check                   Compare timings and memory of the extraction
+                          with the baseline. The measurement is repeated
+                          up to 3 times when some metric regressed.
+                          Exits with status 1 if it still regressed and
+                          with status 2 if the corpus isn't the one
+                          of the baseline.
+  profile                 Extract the readable article of every document
+                          once and profile sampled documents. Prints
+                          statistics aggregated over the profiled
+                          documents and the slowest documents.
+
+Options:
+  -r <n>, --repeat=<n>    Number of runs of every measurement, the best
+                          one is reported [default: 3].
+  --json=<file>           Write results as JSON to the file, "-" is
+                          the standard output.
+  --parameter=<name>      Growing parameter of the synthetic pages:
+                          paragraphs, depth, table_rows or br_runs
+                          [default: paragraphs].
+  --values=<list>         Comma separated values of the parameter
+                          [default: 25,50,100,200,400].
+  --threshold=<k>         Maximal allowed exponent of the growth of time
+                          with the count of elements [default: 1.3].
+  --synthetic=<list>      Comma separated counts of paragraphs of the
+                          synthetic pages added to the corpus
+                          [default: 1000,4000].
+  --output=<file>         File the baseline is written to, the baseline
+                          bundled with breadability by default.
+  --baseline=<file>       File with the baseline, the baseline bundled
+                          with breadability by default.
+  --max-regression=<r>    Allowed relative growth of every metric, times
+                          are normalized by speed of the machine
+                          [default: 0.2].
+  --every=<n>             Profile every n-th document [default: 10].
+  --slower-than=<ms>      Profile also documents slower than the latency
+                          in milliseconds by processing them again.
+  --slowest=<n>           Count of the slowest documents reported and
+                          saved [default: 10].
+  --save=<dir>            Directory the inputs of the slowest documents
+                          are saved to as a corpus for replay.
+  --stats=<file>          File the aggregated statistics are written to
+                          in the format of pstats.
+  --version               Show program's version number and exit.
+  -h, --help              Show this help message and exit.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+import json
+import sys
+
+from docopt import docopt
+from .. import __version__
+from ..benchmarks.corpus import (
+    TEST_ARTICLES_PATH,
+    benchmark_corpus,
+    compare_lite,
+    load_corpus,
+)
+from ..benchmarks.helpers import benchmark_helpers
+from ..benchmarks.memory import benchmark_memory
+from ..benchmarks.regression import (
+    BASELINE_PATH,
+    check_baseline,
+    load_baseline,
+    record_baseline,
+)
+from ..benchmarks.scaling import benchmark_scaling
+from ..benchmarks.stages import STAGES
+from ..benchmarks.synthetic import generate_page
+from ..profiling import SamplingProfiler
+from ..readable import Article
+
+
+def parse_args():
+    return docopt(__doc__, version=__version__)
+
+
+def print_lite_comparison(results):
+    row = "{0:<32} {1:>10} {2:>10} {3:>8} {4:>10} {5:>8}"
+    print(row.format(
+        "document", "full [ms]", "lite [ms]", "speedup", "precision",
+        "recall"))
+
+    for result in results:
+        print(row.format(
+            result["name"][:32],
+            "%.1f" % (result["full_time"] * 1000),
+            "%.1f" % (result["lite_time"] * 1000),
+            "%.2f" % result["speedup"],
+            "%.3f" % result["precision"],
+            "%.3f" % result["recall"],
+        ))
+
+    full_time = sum(r["full_time"] for r in results)
+    lite_time = sum(r["lite_time"] for r in results)
+    count = len(results) or 1
+    print(row.format(
+        "TOTAL",
+        "%.1f" % (full_time * 1000),
+        "%.1f" % (lite_time * 1000),
+        "%.2f" % (full_time / lite_time if lite_time else 0),
+        "%.3f" % (sum(r["precision"] for r in results) / count),
+        "%.3f" % (sum(r["recall"] for r in results) / count),
+    ))
+
+
+def print_corpus_benchmark(results):
+    print("%d documents, %.1f kB, %d warm runs" % (
+        results["documents"], results["bytes"] / 1024, results["repeat"]))
+
+    row = "{0:<12} {1:<5} {2:>10} {3:>10} {4:>9} {5:>9} {6:>9}"
+    print(row.format(
+        "operation", "run", "docs/s", "kB/s", "p50 [ms]", "p95 [ms]",
+        "p99 [ms]"))
+
+    for name, runs in results["operations"].items():
+        for run in ("cold", "warm"):
+            result = runs[run]
+            print(row.format(
+                name, run,
+                "%.1f" % (result["docs_per_sec"] or 0),
+                "%.1f" % ((result["bytes_per_sec"] or 0) / 1024),
+                "%.1f" % (result["p50"] * 1000),
+                "%.1f" % (result["p95"] * 1000),
+                "%.1f" % (result["p99"] * 1000),
+            ))
+
+
+def print_helpers_benchmark(results):
+    row = "{0:<40} {1:>8} {2:>11} {3:>14}"
+    print(row.format("helper", "calls", "total [ms]", "per call [us]"))
+
+    for result in results:
+        print(row.format(
+            result["name"],
+            result["calls"],
+            "%.2f" % (result["total_time"] * 1000),
+            "%.2f" % ((result["time_per_call"] or 0) * 1000000),
+        ))
+
+
+def print_scaling_benchmark(results):
+    columns = STAGES + ("total",)
+    row = "{0:>8} {1:>9}" + "".join(
+        " {%d:>9}" % i for i in range(2, len(columns) + 2))
+    print("Time [ms] of stages by %s" % results["parameter"])
+    print(row.format("value", "elements", *columns))
+
+    for page in results["pages"]:
+        print(row.format(
+            page["value"], page["elements"],
+            *("%.2f" % (page["times"][c] * 1000) for c in columns)))
+
+    exponents = results["exponents"]
+    print(row.format("exponent", "", *(
+        "-" if exponents[c] is None else "%.2f" % exponents[c]
+        for c in columns)))
+
+    for stage in results["superlinear"]:
+        print("Super-linear growth of stage '%s' (exponent %.2f > %.2f)" % (
+            stage, exponents[stage], results["threshold"]))
+
+
+def print_memory_benchmark(results):
+    row = "{0:<24} {1:<10} {2:>10} {3:>13} {4:>10}"
+    print(row.format("document", "stage", "peak [kB]", "retained [kB]",
+        "RSS [kB]"))
+
+    for document in results["documents"]:
+        for stage in STAGES:
+            result = document["stages"][stage]
+            print(row.format(
+                document["name"][:24], stage,
+                "%.1f" % (result["peak"] / 1024),
+                "%.1f" % (result["retained"] / 1024),
+                "-" if result["rss"] is None else
+                "%.1f" % (result["rss"] / 1024),
+            ))
+
+    if results["peak_rss"] is not None:
+        print("Peak RSS of the process: %.1f MB" % (
+            results["peak_rss"] / 1024 / 1024))
+
+
+def print_comparison(results):
+    print("Times are multiples of the calibration workload.")
+    row = "{0:<28} {1:>12} {2:>12} {3:>7}  {4}"
+    print(row.format("metric", "baseline", "current", "ratio", ""))
+
+    for result in results:
+        print(row.format(
+            result["name"],
+            "%.4g" % result["baseline"],
+            "%.4g" % result["current"],
+            "-" if result["ratio"] is None else "%.2f" % result["ratio"],
+            "REGRESSED" if result["regressed"] else "",
+        ))
+
+
+def profile_corpus(documents, args):
+    threshold = args["--slower-than"]
+    profiler = SamplingProfiler(
+        every=int(args["--every"]),
+        threshold=float(threshold) / 1000 if threshold else None,
+        keep_slowest=int(args["--slowest"]))
+
+    for name, html in documents:
+        profiler.call(name, html, lambda html: Article(html).readable)
+
+    print("%d documents, %d profiled" % (
+        profiler.documents, profiler.profiled))
+    print(profiler.report())
+
+    print("{0:<40} {1:>12}".format("slowest document", "latency [ms]"))
+    for name, latency in profiler.slowest:
+        print("{0:<40} {1:>12}".format(name[:40], "%.1f" % (latency * 1000)))
+
+    if args["--stats"]:
+        profiler.dump_stats(args["--stats"])
+    if args["--save"]:
+        profiler.save_slowest(args["--save"])
+
+
+def write_json(results, file_path):
+    content = json.dumps(results, indent=2, sort_keys=True)
+    if file_path == "-":
+        print(content)
+    else:
+        with open(file_path, "w") as file:
+            file.write(content + "\n")
+
+
+def main():
+    args = parse_args()
+    repeat = int(args["--repeat"])
+
+    if args["scaling"]:
+        values = [int(v) for v in args["--values"].split(",")]
+        results = benchmark_scaling(
+            args["--parameter"], values, repeat,
+            float(args["--threshold"]))
+        if args["--json"]:
+            write_json(results, args["--json"])
+        else:
+            print_scaling_benchmark(results)
+        return 1 if results["superlinear"] else 0
+
+    documents = load_corpus(args["<corpus>"])
+    if not documents and not args["memory"]:
+        print("No article found in the corpus %s." % (
+            args["<corpus>"] or TEST_ARTICLES_PATH), file=sys.stderr)
+        return 2
+
+    if args["lite"]:
+        print_lite_comparison(compare_lite(documents, repeat))
+    elif args["corpus"]:
+        results = benchmark_corpus(documents, repeat=repeat)
+        if args["--json"]:
+            write_json(results, args["--json"])
+        else:
+            print_corpus_benchmark(results)
+    elif args["helpers"]:
+        results = benchmark_helpers(documents, repeat=repeat)
+        if args["--json"]:
+            write_json(results, args["--json"])
+        else:
+            print_helpers_benchmark(results)
+    elif args["baseline"]:
+        write_json(
+            record_baseline(documents, repeat),
+            args["--output"] or BASELINE_PATH)
+    elif args["check"]:
+        baseline = load_baseline(args["--baseline"])
+        try:
+            results = check_baseline(
+                baseline, documents, repeat, float(args["--max-regression"]))
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        print_comparison(results)
+        return 1 if any(r["regressed"] for r in results) else 0
+    elif args["profile"]:
+        profile_corpus(documents, args)
+    elif args["memory"]:
+        for paragraphs in args["--synthetic"].split(","):
+            html = generate_page(int(paragraphs)).encode("utf8")
+            documents.append(("synthetic_%s" % paragraphs, html))
+
+        results = benchmark_memory(documents)
+        if args["--json"]:
+            write_json(results, args["--json"])
+        else:
+            print_memory_benchmark(results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
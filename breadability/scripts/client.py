@@ -15,7 +15,7 @@ Options:
   -f, --fragment  Output html fragment by default.
   -b, --browser   Open the parsed content in your web browser.
   -d, --debug     Output the detailed scoring information for debugging
-                  parsing.
+                  parsing to the standard error.
   -v, --verbose   Increase logging verbosity to DEBUG.
   --version       Display program's version number and exit.
   -h, --help      Display this help message and exit.
@@ -27,6 +27,7 @@ from __future__ import division, print_function, unicode_literals
 
 import logging
 import locale
+import sys
 import webbrowser
 
 from tempfile import NamedTemporaryFile
@@ -59,19 +60,18 @@ def main():
     if resource.startswith("www"):
         resource = "http://" + resource
 
-    url = None
     if resource.startswith("http://") or resource.startswith("https://"):
-        url = resource
-
-        request = urllib.Request(url, headers=HEADERS)
+        request = urllib.Request(resource, headers=HEADERS)
         response = urllib.urlopen(request)
         content = response.read()
         response.close()
+
+        document = Article(content, url=resource,
+            return_fragment=args["--fragment"], trace=args["--debug"])
     else:
-        with open(resource, "r") as file:
-            content = file.read()
+        document = Article.from_path(resource,
+            return_fragment=args["--fragment"], trace=args["--debug"])
 
-    document = Article(content, url=url, return_fragment=args["--fragment"])
     if args["--browser"]:
         html_file = NamedTemporaryFile(mode="wb", suffix=".html", delete=False)
 
@@ -85,6 +85,9 @@ def main():
         content = document.readable.encode(encoding)
         print(content)
 
+    if args["--debug"]:
+        print(document.trace.format(), file=sys.stderr)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,68 @@
+# -*- coding: utf8 -*-
+
+"""Wall and CPU time spent in the stages of processing of a document."""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from contextlib import contextmanager
+from timeit import default_timer
+
+try:
+    from time import process_time
+except ImportError:
+    # Python 2
+    from time import clock as process_time
+
+
+class StageTimer(object):
+    """
+    Measures stages of processing of a single document. Time of the stage
+    measured repeatedly is summed.
+
+    :param callback: Optional callable ``callback(stage, wall, cpu)``
+        called after every measured stage with its times in seconds.
+    :param bool recording: If False nothing is measured nor recorded.
+        Such timer holds no state.
+    """
+
+    def __init__(self, callback=None, recording=True):
+        self.recording = recording
+        self._callback = callback
+        self._timings = {}
+
+    @property
+    def timings(self):
+        """
+        Mapping of the measured stages to pairs ``(wall, cpu)`` of times
+        in seconds. Nested stages are included in their parent stages.
+        """
+        return dict(self._timings)
+
+    @contextmanager
+    def measure(self, stage):
+        """Measures the code in the context as the stage."""
+        if not self.recording:
+            yield
+            return
+
+        wall, cpu = default_timer(), process_time()
+        try:
+            yield
+        finally:
+            self.record(
+                stage, default_timer() - wall, process_time() - cpu)
+
+    def record(self, stage, wall, cpu):
+        """Records times of the stage measured elsewhere."""
+        if not self.recording:
+            return
+
+        total_wall, total_cpu = self._timings.get(stage, (0.0, 0.0))
+        self._timings[stage] = (total_wall + wall, total_cpu + cpu)
+        if self._callback is not None:
+            self._callback(stage, wall, cpu)
+
+
+# timer measuring nothing
+NO_TIMER = StageTimer(recording=False)
@@ -0,0 +1,99 @@
+# -*- coding: utf8 -*-
+
+"""
+Optional structured trace of the decisions made during processing
+of a document: scores of candidates, dropped nodes with the reason and
+decisions about siblings of the winning candidate. The trace is activated
+for the current thread by `tracing` and events are recorded by
+`trace_event` which does nothing when no trace is active.
+"""
+
+from __future__ import absolute_import
+from __future__ import division, print_function, unicode_literals
+
+from contextlib import contextmanager
+from threading import local
+
+from ._compat import string_types
+
+
+_state = local()
+
+
+def describe_node(node):
+    """Returns short CSS-like description of the node, e.g. "div#id.a.b"."""
+    description = node.tag if isinstance(node.tag, string_types) else "?"
+    if node.get("id"):
+        description += "#" + node.get("id")
+    for name in (node.get("class") or "").split():
+        description += "." + name
+
+    return description
+
+
+class Trace(object):
+    """Events recorded during processing of a single document."""
+
+    def __init__(self):
+        self._events = []
+
+    @property
+    def events(self):
+        """
+        List of recorded events in the order they happened. Every event
+        is a dictionary with the name of the "event", description of its
+        "node" (see `describe_node`) if any and details of the event.
+        """
+        return list(self._events)
+
+    def record(self, event, node=None, **details):
+        entry = {"event": event}
+        if node is not None:
+            entry["node"] = describe_node(node)
+        entry.update(details)
+        self._events.append(entry)
+
+    def format(self):
+        """Returns the events as text with one event per line."""
+        lines = []
+        for entry in self._events:
+            details = " ".join(
+                "%s=%s" % (key, _format_value(entry[key]))
+                for key in sorted(entry) if key not in ("event", "node"))
+            line = " ".join(
+                part for part in (entry["event"], entry.get("node"), details)
+                if part)
+            lines.append(line)
+
+        return "\n".join(lines)
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return "%.3f" % value
+    return "%s" % value
+
+
+@contextmanager
+def tracing(trace):
+    """
+    Records events of the current thread within the context into
+    the trace. Nothing is recorded if the trace is ``None``.
+    """
+    if trace is None:
+        yield
+        return
+
+    previous = getattr(_state, "trace", None)
+    _state.trace = trace
+    try:
+        yield
+    finally:
+        _state.trace = previous
+
+
+def trace_event(event, node=None, **details):
+    """Records the event into the active trace if there is any."""
+    trace = getattr(_state, "trace", None)
+    if trace is not None:
+        trace.record(event, node, **details)
@@ -37,6 +37,8 @@ console_script_targets = [
     "breadability-{0} = breadability.scripts.client:main",
     "breadability_test = breadability.scripts.test_helper:main",
     "breadability_test-{0} = breadability.scripts.test_helper:main",
+    "breadability_bench = breadability.scripts.benchmark:main",
+    "breadability_bench-{0} = breadability.scripts.benchmark:main",
 ]
 console_script_targets = [
     target.format(VERSION_SUFFIX) for target in console_script_targets
@@ -82,7 +84,11 @@ setup(
         "Topic :: Text Processing :: Filters",
         "Topic :: Text Processing :: Markup :: HTML",
     ],
-    packages=['breadability', 'breadability.scripts'],
+    packages=[
+        'breadability',
+        'breadability.benchmarks',
+        'breadability.scripts',
+    ],
     include_package_data=True,
     zip_safe=False,
     install_requires=install_requires,
@@ -7,9 +7,18 @@ from __future__ import (
     unicode_literals
 )
 
+import pickle
+
+from lxml.etree import tounicode
 from lxml.html import fragment_fromstring, document_fromstring
+from lxml.sax import saxify
 from breadability.readable import Article
-from breadability.annotated_text import AnnotatedTextHandler
+from breadability.annotated_text import (
+    AnnotatedTextHandler,
+    CompactAnnotatedText,
+    extract_text,
+    iter_text_paragraphs,
+)
 from .utils import load_snippet, load_article
 
 
@@ -168,3 +177,136 @@ def test_real_article():
             (".", None),
         ),
     ]
+
+
+def test_extract_text():
+    dom = fragment_fromstring("<div><p> 1 first<p> 2\tsecond <p>3\rthird   </div>")
+
+    assert extract_text(dom) == "1 first\n\n2 second\n\n3\nthird"
+
+
+def test_extract_text_keeps_lines():
+    dom = fragment_fromstring(
+        "<div><h1>Title</h1> intro<ul><li>one</li><li>two</li></ul>"
+        "<p>last <em>one</em></p></div>")
+
+    assert extract_text(dom) == "Title\nintro\none\ntwo\n\nlast one"
+
+
+def test_extract_text_skips_comments_and_tail():
+    dom = fragment_fromstring("<div><p>a<!-- comment -->b</p></div>")
+    dom.tail = "tail"
+
+    assert extract_text(dom) == "ab"
+
+
+def test_extract_text_of_empty_document():
+    dom = fragment_fromstring("<div>\n\t </div>")
+
+    assert extract_text(dom) == ""
+
+
+def test_text_paragraphs_match_annotated_text():
+    article = Article(load_article("zdrojak_automaticke_zabezpeceni.html"))
+    paragraphs = list(iter_text_paragraphs(article.readable_dom))
+
+    assert len(paragraphs) == len(article.main_text)
+    for text, annotated in zip(paragraphs, article.main_text):
+        annotated_text = "".join(t for t, _ in annotated)
+        assert "".join(text.split()) == "".join(annotated_text.split())
+
+
+def test_annotations_are_interned():
+    dom = fragment_fromstring(
+        "<div><p><em>first</em> text <em>second</em></p></div>")
+    paragraph, = AnnotatedTextHandler.parse(dom)
+
+    assert paragraph[0][1] is paragraph[2][1]
+
+
+def test_tail_of_parsed_element_is_ignored():
+    dom = fragment_fromstring("<div><p>text</p></div>")
+    dom.tail = "tail"
+
+    assert AnnotatedTextHandler.parse(dom) == [(("text", None),)]
+
+
+def test_parse_does_not_change_dom():
+    dom = fragment_fromstring("<div><p>text <em>emphasis</em></p></div>")
+    html = tounicode(dom)
+    AnnotatedTextHandler.parse(dom)
+
+    assert tounicode(dom) == html
+
+
+def test_sax_handler_gives_the_same_content():
+    dom = document_fromstring(load_snippet("h1_and_2_paragraphs.html"))
+    handler = AnnotatedTextHandler()
+    saxify(dom.find("body"), handler)
+
+    assert handler.content == AnnotatedTextHandler.parse(dom.find("body"))
+
+
+def test_compact_annotated_text():
+    content = [
+        (("text", None), ("emphasis", ("em",))),
+        (("last", None), ("one", ("em",))),
+    ]
+    compact = CompactAnnotatedText.from_content(content)
+
+    assert compact.text == "text emphasis\n\nlast one"
+    assert list(compact.spans) == [0, 4, 0, 5, 13, 1, 15, 19, 0, 20, 23, 1]
+    assert list(compact.paragraphs) == [2, 4]
+    assert compact.annotations == (None, ("em",))
+    assert compact.to_content() == content
+
+
+def test_compact_annotated_text_of_empty_content():
+    compact = CompactAnnotatedText.from_content([])
+
+    assert compact.text == ""
+    assert compact.to_content() == []
+
+
+def test_compact_annotated_text_of_real_article():
+    content = Article(load_article("zdrojak_automaticke_zabezpeceni.html")).main_text
+    compact = CompactAnnotatedText.from_content(content)
+
+    assert compact.to_content() == content
+
+
+def test_compact_annotated_text_is_picklable():
+    content = Article(load_snippet("annotated_1.html")).main_text
+    compact = CompactAnnotatedText.from_content(content)
+    unpickled = pickle.loads(pickle.dumps(compact, pickle.HIGHEST_PROTOCOL))
+
+    assert unpickled == compact
+    assert unpickled.to_content() == content
+
+
+def test_iter_paragraphs():
+    dom = fragment_fromstring("<div><p> 1 first<p> 2\tsecond <p>3\rthird   </div>")
+    paragraphs = AnnotatedTextHandler.iter_paragraphs(dom)
+
+    assert next(paragraphs) == (("1 first", None),)
+    assert next(paragraphs) == (("2 second", None),)
+    assert next(paragraphs) == (("3\nthird", None),)
+    assert list(paragraphs) == []
+
+
+def test_iter_paragraphs_yields_before_whole_dom_is_walked():
+    dom = fragment_fromstring("<div><p>first</p><p>second</p></div>")
+    paragraphs = AnnotatedTextHandler.iter_paragraphs(dom)
+
+    assert next(paragraphs) == (("first", None),)
+    # the rest of DOM can be changed while it's not walked yet
+    dom[1].text = "changed"
+    assert list(paragraphs) == [(("changed", None),)]
+
+
+def test_iter_paragraphs_into_compact_text():
+    dom = fragment_fromstring("<div><p>text <em>emphasis</em></p></div>")
+    compact = CompactAnnotatedText.from_content(
+        AnnotatedTextHandler.iter_paragraphs(dom))
+
+    assert compact.to_content() == AnnotatedTextHandler.parse(dom)
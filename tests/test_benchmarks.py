@@ -0,0 +1,292 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import json
+
+import pytest
+
+from lxml.etree import tounicode
+
+from breadability.benchmarks.corpus import (
+    benchmark_corpus,
+    compare_lite,
+    load_corpus,
+    percentile,
+    words_overlap,
+)
+from breadability.benchmarks.helpers import (
+    MICROBENCHMARKS,
+    Samples,
+    benchmark_helpers,
+)
+from breadability.benchmarks.memory import (
+    benchmark_memory,
+    get_rss,
+    tracemalloc,
+)
+from breadability.benchmarks.regression import (
+    BASELINE_PATH,
+    calibrate,
+    check_baseline,
+    compare_metrics,
+    load_baseline,
+    record_baseline,
+)
+from breadability.benchmarks.scaling import (
+    benchmark_scaling,
+    count_elements,
+    growth_exponent,
+)
+from breadability.benchmarks.stages import STAGES, run_stages
+from breadability.benchmarks.synthetic import generate_page
+from breadability.readable import Article
+from breadability.scripts import benchmark
+from .utils import load_article, load_snippet
+
+
+def test_load_corpus():
+    documents = load_corpus()
+
+    assert len(documents) > 0
+    for name, html in documents:
+        assert name.startswith("test_")
+        assert len(html) > 0
+
+
+def test_words_overlap():
+    precision, recall = words_overlap("a b c d", "a b x")
+
+    assert precision == 2 / 3
+    assert recall == 2 / 4
+
+
+def test_words_overlap_of_empty_texts():
+    assert words_overlap("", "") == (1.0, 1.0)
+
+
+def test_compare_lite():
+    documents = [("min", load_snippet("document_min.html"))]
+    results = compare_lite(documents, repeat=1)
+
+    assert len(results) == 1
+    assert results[0]["name"] == "min"
+    assert results[0]["recall"] == 1.0
+
+
+def test_percentile():
+    values = list(range(100, 0, -1))
+
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile(values, 0.0) == 1
+    assert percentile([], 0.5) is None
+
+
+def test_benchmark_corpus():
+    documents = [("min", load_snippet("document_min.html"))]
+    results = benchmark_corpus(documents, ("readable", "title"), repeat=2)
+
+    assert results["documents"] == 1
+    assert results["bytes"] == len(documents[0][1])
+    assert sorted(results["operations"]) == ["readable", "title"]
+
+    readable = results["operations"]["readable"]
+    assert readable["cold"]["documents"] == 1
+    assert readable["warm"]["documents"] == 2
+    assert readable["warm"]["p50"] <= readable["warm"]["p99"]
+    assert json.loads(json.dumps(results)) == results
+
+
+def test_benchmark_corpus_unknown_operation():
+    with pytest.raises(ValueError):
+        benchmark_corpus([], ("unknown",))
+
+
+def test_samples():
+    samples = Samples([("article", load_snippet("h1_and_2_paragraphs.html"))])
+
+    assert len(samples.pages) == len(samples.documents) == 1
+    assert samples.nodes
+    assert all(n.tag in ("p", "td", "pre") for n in samples.scorable_nodes[0])
+    assert len(samples.node_texts) == len(samples.scorable_nodes[0])
+
+
+def test_benchmark_helpers():
+    documents = [("min", load_snippet("document_min.html"))]
+    results = benchmark_helpers(documents, repeat=1)
+
+    assert [r["name"] for r in results] == [n for n, _, _ in MICROBENCHMARKS]
+    for result in results:
+        assert result["calls"] >= 0
+        assert result["total_time"] >= 0
+
+
+def test_benchmark_helpers_unknown_helper():
+    with pytest.raises(ValueError):
+        benchmark_helpers([], ["unknown"])
+
+
+def test_run_stages_same_as_article():
+    html = load_article("ars.001.html")
+    called = []
+
+    def run(name, function, *args):
+        called.append(name)
+        return function(*args)
+
+    readable = run_stages(html, run)
+
+    assert tuple(called) == STAGES
+    assert tounicode(readable) == Article(html).readable
+
+
+def test_generated_page_is_deterministic():
+    assert generate_page(seed=1) == generate_page(seed=1)
+    assert generate_page(seed=1) != generate_page(seed=2)
+
+
+def test_generated_page_grows_linearly():
+    small = count_elements(generate_page(paragraphs=10))
+    big = count_elements(generate_page(paragraphs=20))
+
+    assert 1.8 < big / small < 2.2
+
+
+def test_generated_page_article_extracted():
+    html = generate_page(paragraphs=10, table_rows=3, br_runs=2)
+    readable = Article(html).readable
+
+    assert "<h1>" in readable
+    assert "/related/" not in readable
+    assert "/section/" not in readable
+
+
+def test_growth_exponent():
+    sizes = [10, 20, 40, 80]
+
+    assert growth_exponent(sizes, [s * 2.0 for s in sizes]) == pytest.approx(1)
+    assert growth_exponent(sizes, [s ** 2 for s in sizes]) == pytest.approx(2)
+    assert growth_exponent([10], [1.0]) is None
+    assert growth_exponent([10, 10], [1.0, 2.0]) is None
+
+
+def test_benchmark_scaling():
+    results = benchmark_scaling("paragraphs", (2, 4), repeat=1)
+
+    assert results["parameter"] == "paragraphs"
+    assert [page["value"] for page in results["pages"]] == [2, 4]
+    assert set(results["exponents"]) == set(STAGES + ("total",))
+    assert json.loads(json.dumps(results)) == results
+
+
+def test_benchmark_scaling_fixed_parameter():
+    with pytest.raises(ValueError):
+        benchmark_scaling("depth", (1, 2), depth=3)
+
+
+@pytest.mark.skipif(tracemalloc is None, reason="requires tracemalloc")
+def test_benchmark_memory():
+    documents = [
+        ("min", load_snippet("document_min.html")),
+        ("synthetic", generate_page(paragraphs=50).encode("utf8")),
+    ]
+    results = benchmark_memory(documents)
+
+    assert [d["name"] for d in results["documents"]] == ["min", "synthetic"]
+    for document in results["documents"]:
+        assert set(document["stages"]) == set(STAGES)
+        for result in document["stages"].values():
+            assert result["peak"] >= result["retained"] >= 0
+
+    decode = results["documents"][1]["stages"]["decode"]
+    assert decode["retained"] > 0
+    assert json.loads(json.dumps(results)) == results
+    assert not tracemalloc.is_tracing()
+
+
+def test_get_rss():
+    rss = get_rss()
+    assert rss is None or rss > 0
+
+
+def test_compare_metrics():
+    baseline = {"metrics": {
+        "time.faster": 10.0,
+        "time.slower": 10.0,
+        "time.noise": 0.01,
+        "time.missing": 1.0,
+        "memory.bigger": 10 ** 6,
+    }}
+    current = {"metrics": {
+        "time.faster": 5.0,
+        "time.slower": 13.0,
+        "time.noise": 0.05,
+        "memory.bigger": 2 * 10 ** 6,
+        "memory.new": 10,
+    }}
+
+    results = compare_metrics(baseline, current, max_regression=0.2)
+
+    assert [r["name"] for r in results] == [
+        "memory.bigger", "time.faster", "time.noise", "time.slower"]
+    regressed = [r["name"] for r in results if r["regressed"]]
+    assert regressed == ["memory.bigger", "time.slower"]
+    assert results[1]["ratio"] == 0.5
+
+
+def test_record_baseline():
+    documents = [("min", load_snippet("document_min.html"))]
+    baseline = record_baseline(documents, repeat=1)
+
+    assert baseline["calibration"] > 0
+    assert "time.readable" in baseline["metrics"]
+    assert "time.stage.score" in baseline["metrics"]
+    assert baseline["corpus"] == [["min", len(documents[0][1])]]
+    assert json.loads(json.dumps(baseline)) == baseline
+
+    results = compare_metrics(baseline, baseline)
+    assert not any(r["regressed"] for r in results)
+
+
+def test_bundled_baseline():
+    baseline = load_baseline(BASELINE_PATH)
+
+    assert baseline["calibration"] > 0
+    for stage in STAGES:
+        assert "time.stage.%s" % stage in baseline["metrics"]
+
+
+def test_bundled_baseline_matches_test_articles():
+    baseline = load_baseline(BASELINE_PATH)
+    names = [name for name, _ in load_corpus()]
+
+    assert [name for name, _ in baseline["corpus"]] == names
+
+
+def test_check_baseline_of_other_corpus():
+    baseline = load_baseline(BASELINE_PATH)
+    documents = [("min", load_snippet("document_min.html"))]
+
+    with pytest.raises(ValueError):
+        check_baseline(baseline, [], repeat=1)
+    with pytest.raises(ValueError):
+        check_baseline(baseline, documents, repeat=1)
+
+
+def test_calibrate():
+    assert calibrate(repeat=1) > 0
+
+
+def test_command_over_empty_corpus_fails(tmpdir, monkeypatch, capsys):
+    monkeypatch.setattr(
+        "sys.argv", ["breadability_bench", "corpus", str(tmpdir)])
+
+    assert benchmark.main() == 2
+    assert "No article found" in capsys.readouterr().err
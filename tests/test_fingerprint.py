@@ -0,0 +1,117 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+from breadability.fingerprint import (
+    SimHash,
+    SimHashIndex,
+    hamming_distance,
+    simhash,
+)
+from breadability.readable import Article
+from .utils import load_article
+
+
+def test_simhash_of_pieces_same_as_whole_text():
+    text = "The quick brown fox jumps over the lazy dog again and again"
+    hasher = SimHash()
+    hasher.update("The quick brown fox")
+    hasher.update("jumps over the lazy dog again and again")
+
+    assert hasher.digest() == simhash([text])
+
+
+def test_simhash_ignores_case_and_punctuation():
+    assert simhash(["Hello, world! How are you?"]) == simhash(
+        ["hello world how are you"])
+
+
+def test_simhash_of_empty_text():
+    assert simhash([]) is None
+    assert simhash(["", " - "]) is None
+    assert simhash(["word"]) is not None
+
+
+def test_hamming_distance():
+    assert hamming_distance(0, 0) == 0
+    assert hamming_distance(0b1011, 0b0001) == 2
+
+
+def test_article_fingerprint_same_as_text_fingerprint():
+    html = load_article("ars.001.html")
+    article = Article(html)
+    fingerprint = article.fingerprint
+
+    assert fingerprint == simhash([article.text])
+    assert article.text == Article(html).text
+
+    article = Article(html)
+    article.text
+    assert article.fingerprint == fingerprint
+
+
+def test_near_duplicate_articles():
+    html = load_article("ars.001.html")
+    edited = html.replace(
+        b"Noon approached on September 1, 1859",
+        b"At noon on the first of September 1859")
+    other = load_article("python.org-wiki.performancetips.html")
+
+    fingerprint = Article(html).fingerprint
+
+    assert hamming_distance(fingerprint, Article(edited).fingerprint) <= 3
+    assert hamming_distance(fingerprint, Article(other).fingerprint) > 3
+
+
+def test_index_finds_near_duplicates():
+    index = SimHashIndex(max_distance=3)
+    index.add("first", 0b1111)
+    index.add("second", 0b0111 | 1 << 40)
+    index.add("far", 0xFFFF << 20)
+    index.add("empty", None)
+
+    assert len(index) == 3
+    assert index.find(0b1111) == ["first", "second"]
+    assert index.find(0xFFFF << 20) == ["far"]
+    assert index.find(None) == []
+
+
+def test_index_groups_transitively():
+    index = SimHashIndex(max_distance=1)
+    index.add("a", 0b000)
+    index.add("unique", 0xFF << 50)
+    index.add("b", 0b001)
+    index.add("c", 0b011)
+
+    assert index.groups() == [["a", "b", "c"], ["unique"]]
+
+
+def test_index_groups_articles():
+    html = load_article("ars.001.html")
+    pages = {
+        "ars": html,
+        "syndicated": html.replace(b"<title>", b"<title>Syndicated: "),
+        "other": load_article("python.org-wiki.performancetips.html"),
+    }
+
+    index = SimHashIndex()
+    for key in ("ars", "other", "syndicated"):
+        index.add(key, Article(pages[key]).fingerprint)
+
+    assert index.groups() == [["ars", "syndicated"], ["other"]]
+
+
+def test_index_groups_many_identical_fingerprints():
+    index = SimHashIndex()
+    keys = ["copy%d" % i for i in range(3000)]
+    for key in keys:
+        index.add(key, 0xABCDEF)
+    index.add("unique", 0xFF << 50)
+
+    assert index.groups() == [keys, ["unique"]]
+    assert index.find(0xABCDEF) == keys
@@ -0,0 +1,122 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import pickle
+
+from os.path import join
+
+from lxml.html import fragment_fromstring
+
+from breadability.incremental import ExtractionState, fingerprint_subtrees
+from breadability.readable import Article
+from .utils import TEST_DIR, load_article
+
+
+def test_fingerprints_independent_of_position():
+    dom = fragment_fromstring(
+        "<div><p>first</p><div><p>first</p></div><p>second</p></div>")
+    fingerprints = fingerprint_subtrees(dom)
+    first, wrapper, second = dom
+
+    assert fingerprints[first] == fingerprints[wrapper[0]]
+    assert fingerprints[first] != fingerprints[second]
+
+
+def test_fingerprints_changed_with_content():
+    dom = fragment_fromstring("<div><p>text</p><p>other</p></div>")
+    before = fingerprint_subtrees(dom)
+
+    dom[0].tail = "tail"
+    after = fingerprint_subtrees(dom)
+
+    assert before[dom[0]] == after[dom[0]]
+    assert before[dom[1]] == after[dom[1]]
+    assert before[dom] != after[dom]
+
+
+def test_extraction_state_pickled():
+    state = Article(load_article("ars.001.html"),
+                    incremental=True).extraction_state
+    copy = pickle.loads(pickle.dumps(state))
+
+    assert isinstance(copy, ExtractionState)
+    assert copy.scores == state.scores
+    assert copy.winner == state.winner
+    assert copy.winner_parent == state.winner_parent
+    assert copy.readable == state.readable
+    assert copy.options == state.options
+
+
+def test_no_extraction_state_by_default():
+    assert Article(load_article("ars.001.html")).extraction_state is None
+
+
+def test_unchanged_page_reused():
+    html = load_article("ars.001.html")
+    state = Article(html, incremental=True).extraction_state
+
+    article = Article(html, previous=state)
+
+    assert article.unchanged
+    assert article.readable == state.readable
+    assert "_cached_property_readable_dom" not in article.__dict__
+
+
+def test_changed_page_outside_article_reused():
+    html = load_article("ars.001.html")
+    state = Article(html, incremental=True).extraction_state
+    changed = html.replace(
+        b'<div id="slogan">Serving', b'<div id="slogan">Still serving')
+
+    article = Article(changed, previous=state)
+
+    assert article.unchanged
+    assert article.readable == Article(changed).readable
+
+
+def test_changed_article_extracted_again():
+    html = load_article("ars.001.html")
+    state = Article(html, incremental=True).extraction_state
+    changed = html.replace(
+        b"Noon approached on September 1, 1859",
+        b"Noon approached on the first of September 1859")
+
+    article = Article(changed, previous=state)
+
+    assert not article.unchanged
+    assert "the first of September 1859" in article.readable
+    assert article.readable == Article(changed).readable
+    assert article.extraction_state.winner != state.winner
+
+
+def test_state_with_different_options_ignored():
+    html = load_article("ars.001.html")
+    state = Article(html, incremental=True).extraction_state
+
+    article = Article(html, previous=state, return_fragment=False)
+
+    assert not article.unchanged
+    assert article.readable == Article(html, return_fragment=False).readable
+
+
+def test_no_extraction_state_of_fallback():
+    # the winner of the page is cleaned out and the whole page is used
+    path = join(TEST_DIR, "test_articles", "test_antipope_org", "article.html")
+    with open(path, "rb") as file:
+        html = file.read()
+    article = Article(html, incremental=True)
+    article.readable
+
+    assert article.extraction_state is None
+
+    changed = html.replace(b"</body>", b"<div>New content.</div></body>")
+    article = Article(changed, previous=article.extraction_state)
+
+    assert not article.unchanged
+    assert article.readable == Article(changed).readable
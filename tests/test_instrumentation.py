@@ -0,0 +1,117 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+from threading import Thread
+
+from lxml.html import HtmlElement, fragment_fromstring
+
+from breadability.benchmarks.synthetic import generate_page
+from breadability.instrumentation import (
+    OperationCounters,
+    counted,
+    counting,
+)
+from breadability.readable import Article
+from breadability.scoring import (
+    CLS_UNLIKELY,
+    get_link_density,
+    is_unlikely_node,
+)
+from .utils import load_article
+
+
+def test_operations_counted_in_context():
+    node = fragment_fromstring(
+        '<div class="sidebar"><p>first</p><p>second</p></div>')
+    counters = OperationCounters()
+
+    get_link_density(node)
+    with counting(counters):
+        assert get_link_density(node) == 0.0
+        assert is_unlikely_node(node)
+    get_link_density(node)
+
+    operations = counters.operations
+    assert sorted(operations) == ["findall", "search", "text_content"]
+    assert operations["findall"][0] == 2
+    assert operations["text_content"][0] == 1
+    assert operations["search"][0] > 0
+    assert operations["search"][1] >= 0
+
+
+def test_counting_leaves_lxml_and_patterns_intact():
+    originals = dict(vars(HtmlElement))
+
+    with counting(OperationCounters()):
+        assert dict(vars(HtmlElement)) == originals
+        assert CLS_UNLIKELY.match("sidebar")
+
+    assert dict(vars(HtmlElement)) == originals
+
+
+def test_counted_function_returned_without_counters():
+    function = HtmlElement.text_content
+
+    assert counted("text_content", function) is function
+    with counting(OperationCounters()):
+        assert counted("text_content", function) is not function
+        with counting(None):
+            assert counted("text_content", function) is not function
+
+
+def test_counting_of_nested_contexts():
+    node = fragment_fromstring("<p>text</p>")
+    outer, inner = OperationCounters(), OperationCounters()
+
+    with counting(outer):
+        with counting(inner):
+            get_link_density(node)
+        with counting(None):
+            get_link_density(node)
+
+    assert inner.operations["text_content"][0] == 1
+    assert outer.operations["text_content"][0] == 1
+
+
+def test_counting_only_in_current_thread():
+    node = fragment_fromstring("<p>text</p>")
+    counters = OperationCounters()
+
+    with counting(counters):
+        thread = Thread(target=get_link_density, args=(node,))
+        thread.start()
+        thread.join()
+
+    assert counters.operations == {}
+
+
+def test_article_operations_not_counted_by_default():
+    article = Article(load_article("ars.001.html"))
+    article.readable
+
+    assert article.operations is None
+
+
+def test_article_operations():
+    article = Article(load_article("ars.001.html"), count_operations=True)
+    article.readable
+    operations = article.operations
+
+    for name in ("text_content", "findall", "search", "drop_tree"):
+        calls, time = operations[name]
+        assert calls > 0 and time >= 0
+
+
+def test_article_operations_grow_linearly():
+    def count_text_content(paragraphs):
+        article = Article(generate_page(paragraphs), count_operations=True)
+        article.readable
+        return article.operations["text_content"][0]
+
+    assert count_text_content(40) < 2.5 * count_text_content(20)
@@ -0,0 +1,138 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+from lxml.etree import tounicode
+from lxml.html import document_fromstring, fragment_fromstring
+
+from breadability.journal import IN_PLACE, Journal
+from breadability.readable import Article
+from .utils import load_article
+
+
+def test_rollback_reverts_changes():
+    dom = fragment_fromstring(
+        "<div>text<p>first</p>tail<p>second</p><b>bold</b>end</div>")
+    original = tounicode(dom)
+    first, second, bold = dom
+
+    journal = Journal()
+    journal.retag(first, "div")
+    journal.set_text(first, "changed")
+    journal.set(first, "class", "new")
+    journal.set(first, "class", "newer")
+    journal.set_tail(second, None)
+    journal.move(bold, first)
+    journal.move(dom.makeelement("p", {}), dom, 0)
+    journal.drop_tree(second)
+    journal.remove(first)
+    assert tounicode(dom) != original
+
+    journal.rollback()
+
+    assert tounicode(dom) == original
+    assert tuple(dom) == (first, second, bold)
+
+
+def test_replay_applies_reverted_changes():
+    dom = fragment_fromstring("<div><p>first</p><p>second</p></div>")
+    first, second = dom
+
+    journal = Journal()
+    journal.retag(first, "div")
+    journal.move(first, second)
+    changed = tounicode(dom)
+    journal.rollback()
+
+    assert journal.replay()
+    assert tounicode(dom) == changed
+    assert not journal.replay()
+
+
+def test_drop_tree_keeps_tail():
+    dom = fragment_fromstring("<div>a<p>b</p>c<p>d</p>e</div>")
+
+    journal = Journal()
+    journal.drop_tree(dom[1])
+    journal.drop_tree(dom[0])
+
+    assert tounicode(dom) == "<div>ace</div>"
+
+
+def test_in_place_journal_records_nothing():
+    dom = fragment_fromstring("<div><p>text</p></div>")
+
+    IN_PLACE.retag(dom[0], "div")
+    IN_PLACE.rollback()
+
+    assert tounicode(dom) == "<div><div>text</div></div>"
+
+
+def test_given_tree_intact_after_release():
+    tree = document_fromstring(load_article("ars.001.html"))
+    original = tounicode(tree)
+
+    article = Article(tree)
+    assert article.candidates
+    article.release()
+
+    assert tounicode(tree) == original
+
+
+def test_candidates_are_elements_of_given_tree():
+    tree = document_fromstring(load_article("ars.001.html"))
+    article = Article(tree)
+    article.readable
+
+    for node in article.candidates:
+        assert node.getroottree().getroot() is tree
+
+
+def test_given_tree_processed_as_string():
+    html = (
+        '<html><head><base href="/base/"></head><body><div class="post">'
+        '<a name="top" href="javascript:void(0)">top</a>'
+        "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+        "<br><br>Nam et lectus, vitae dignissim nulla, ac mattis lorem."
+        '<script>var x = 1;</script><a href="page.html">page</a>'
+        "</div></body></html>"
+    )
+    url = "http://example.com/article/"
+    tree = document_fromstring(html)
+    original = tounicode(tree)
+
+    article = Article(tree, url=url)
+
+    assert article.readable == Article(html, url=url).readable
+    assert "http://example.com/base/page.html" in article.readable
+    assert tounicode(tree) == original
+
+
+def test_given_tree_intact_after_title():
+    html = (
+        "<html><head><title>Title</title></head><body>"
+        "<div>a<br><br>b<script>x</script></div></body></html>"
+    )
+    tree = document_fromstring(html)
+    original = tounicode(tree)
+
+    assert Article(tree).title == "Title"
+    assert tounicode(tree) == original
+    assert Article(tree).readable == Article(html).readable
+
+
+def test_given_tree_intact_after_candidates():
+    tree = document_fromstring(load_article("ars.001.html"))
+    original = tounicode(tree)
+
+    article = Article(tree)
+    assert article.candidates
+    assert tounicode(tree) == original
+
+    assert article.readable == Article(load_article("ars.001.html")).readable
+    assert tounicode(tree) == original
@@ -0,0 +1,121 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import pytest
+
+from lxml.etree import tounicode
+from lxml.html import fragment_fromstring
+
+from breadability.benchmarks.synthetic import generate_page
+from breadability.limits import LimitExceeded, Limits
+from breadability.readable import Article
+from .utils import load_article, load_snippet
+
+
+def test_no_limits_hit():
+    article = Article(load_snippet("document_min.html"), limits=Limits())
+
+    assert 'id="readabilityBody"' in article.readable
+    assert article.limit_exceeded is None
+
+
+def test_without_limits():
+    article = Article(load_snippet("document_min.html"))
+
+    assert article.limit_exceeded is None
+
+
+def test_max_bytes_truncates_input():
+    html = "<html><body><p>%s</p><p>tail</p></body></html>" % ("text " * 20)
+    article = Article(html, limits=Limits(max_bytes=60))
+
+    assert "text" in article.readable
+    assert "tail" not in article.readable
+    assert article.limit_exceeded == "max_bytes"
+
+
+def test_max_elements_falls_back_to_body():
+    article = Article(load_article("ars.001.html"), limits=Limits(max_elements=50))
+
+    assert article.candidates is None
+    assert 'id="readabilityBody"' in article.readable
+    assert article.limit_exceeded == "max_elements"
+
+
+def test_max_depth():
+    html = "<html><body>%s<p>%s</p>%s</body></html>" % (
+        "<div>" * 100, "Deeply nested paragraph. " * 3, "</div>" * 100)
+    article = Article(html, limits=Limits(max_depth=50))
+
+    assert "Deeply nested paragraph." in article.readable
+    assert article.limit_exceeded == "max_depth"
+
+
+def test_timeout():
+    article = Article(load_article("ars.001.html"), limits=Limits(timeout=0))
+
+    assert 'id="readabilityBody"' in article.readable
+    assert article.limit_exceeded == "timeout"
+
+
+def test_first_exceeded_limit_is_reported():
+    budget = Limits(max_elements=0, timeout=0).budget()
+
+    with pytest.raises(LimitExceeded) as e:
+        budget.visit(None)
+    with pytest.raises(LimitExceeded):
+        budget.check_time()
+
+    assert e.value.limit == "max_elements"
+    assert budget.exceeded == "max_elements"
+
+
+def test_until_deadline_stops_iteration():
+    budget = Limits(timeout=0).budget()
+
+    assert list(budget.until_deadline([1, 2, 3])) == []
+
+
+def test_max_bytes_of_text_measured_in_utf8():
+    budget = Limits(max_bytes=5).budget()
+
+    assert budget.truncate("žluť") == "žlu"
+    assert budget.exceeded == "max_bytes"
+    assert Limits(max_bytes=8).budget().truncate("žluť") == "žluť"
+
+
+def test_copy_within_limits():
+    node = fragment_fromstring(
+        "<div>a<p>b<b>c<i>d</i></b>e</p><!-- x -->f<p>g</p><p>h</p></div>")
+
+    copy = Limits(max_elements=3).budget().copy_within(node)
+    assert tounicode(copy) == "<div>a<p>b<b>c</b>e</p></div>"
+
+    copy = Limits(max_depth=2).budget().copy_within(node)
+    assert tounicode(copy) == "<div>a<p>bcde</p>f<p>g</p><p>h</p></div>"
+
+
+def test_max_elements_bounds_fallback():
+    html = generate_page(paragraphs=500)
+    article = Article(html, limits=Limits(max_elements=100))
+
+    assert len(article.readable) < len(html) / 10
+    body = fragment_fromstring(article.readable)
+    assert len(body.xpath("descendant-or-self::*")) <= 100
+    assert article.limit_exceeded == "max_elements"
+
+
+def test_max_elements_after_max_bytes_bounds_fallback():
+    html = generate_page(paragraphs=2000)
+    limits = Limits(max_elements=100, max_bytes=len(html) - 100)
+    article = Article(html, limits=limits)
+
+    body = fragment_fromstring(article.readable)
+    assert len(body.xpath("descendant-or-self::*")) <= 100
+    assert article.limit_exceeded == "max_bytes"
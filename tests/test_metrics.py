@@ -0,0 +1,134 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import pytest
+
+from breadability import readable
+from breadability.metrics import ExtractionMetrics, MetricsRegistry
+from breadability.readable import Article
+from .utils import load_article, load_snippet
+
+
+def test_counter_export():
+    registry = MetricsRegistry()
+    plain = registry.counter("plain_total", "Plain counter.")
+    labelled = registry.counter("labelled_total", "With labels.", ("kind",))
+    labelled.inc(kind='say "hi"\n')
+    labelled.inc(2, kind="b")
+
+    assert plain.value() == 0
+    assert labelled.value(kind="b") == 2
+    assert registry.export() == (
+        "# HELP plain_total Plain counter.\n"
+        "# TYPE plain_total counter\n"
+        "plain_total 0\n"
+        "# HELP labelled_total With labels.\n"
+        "# TYPE labelled_total counter\n"
+        'labelled_total{kind="b"} 2\n'
+        'labelled_total{kind="say \\"hi\\"\\n"} 1\n'
+    )
+
+
+def test_histogram_export():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", (0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+
+    assert histogram.count() == 4
+    assert registry.export().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 4.25",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_metric_labels_checked():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", "Errors.", ("exception",))
+
+    with pytest.raises(ValueError):
+        counter.inc(kind="x")
+    with pytest.raises(ValueError):
+        registry.counter("errors_total", "Again.")
+
+
+def test_article_metrics():
+    metrics = ExtractionMetrics()
+    html = load_article("ars.001.html")
+    Article(html, metrics=metrics).readable
+    Article(load_snippet("document_min.html"), metrics=metrics).readable
+
+    assert metrics.documents.value() == 2
+    assert metrics.input_size.count() == 2
+    assert metrics.fallbacks.value(reason="no_candidates") == 1
+    assert metrics.stage_seconds.count(stage="find_candidates") == 2
+    assert metrics.stage_seconds.count(stage="prep_article") == 2
+
+    exported = metrics.export()
+    assert "breadability_documents_total 2\n" in exported
+    assert 'breadability_stage_seconds_count{stage="serialize"} 2' in exported
+
+
+def test_article_metrics_with_on_stage():
+    stages = []
+    metrics = ExtractionMetrics()
+    article = Article(
+        load_article("ars.001.html"), metrics=metrics,
+        on_stage=lambda stage, wall, cpu: stages.append(stage))
+    article.readable
+    article.readable_dom
+
+    assert metrics.documents.value() == 1
+    assert sorted(set(stages)) == sorted(article.timings)
+
+
+def test_article_failures_counted(monkeypatch):
+    def fail(self):
+        raise KeyError("broken")
+
+    metrics = ExtractionMetrics()
+    monkeypatch.setattr(Article, "_readable", fail)
+
+    with pytest.raises(KeyError):
+        Article(load_article("ars.001.html"), metrics=metrics).readable
+
+    assert metrics.failures.value(exception="KeyError") == 1
+    assert metrics.documents.value() == 0
+
+
+def test_article_failures_of_scoring_counted(monkeypatch):
+    def fail(*args):
+        raise KeyError("broken")
+
+    metrics = ExtractionMetrics()
+    monkeypatch.setattr(readable, "find_candidates", fail)
+
+    with pytest.raises(KeyError):
+        Article(load_article("ars.001.html"), metrics=metrics).readable
+
+    assert metrics.failures.value(exception="KeyError") == 1
+    assert metrics.documents.value() == 0
+
+
+def test_article_cache_hit_ratios():
+    metrics = ExtractionMetrics()
+    html = load_article("ars.001.html")
+    first = Article(html, incremental=True, metrics=metrics)
+    first.readable
+    assert metrics.cache_hit_ratio("readable") is None
+
+    second = Article(html, previous=first.extraction_state, metrics=metrics)
+    second.readable
+
+    assert metrics.cache_hit_ratio("readable") == 1.0
+    assert metrics.cache_hit_ratio("scores") == 1.0
+    assert metrics.documents.value() == 2
@@ -6,6 +6,11 @@ from __future__ import absolute_import
 from __future__ import division, print_function, unicode_literals
 
 from collections import defaultdict
+
+import pytest
+from lxml.etree import fromstring as xml_fromstring, tounicode
+from lxml.html import document_fromstring
+
 from breadability._compat import (
     to_unicode,
     to_bytes,
@@ -13,10 +18,15 @@ from breadability._compat import (
 )
 
 from breadability.document import (
+    build_document,
+    convert_break_elements_to_paragraphs,
     convert_breaks_to_paragraphs,
+    cut_head,
     decode_html,
+    map_file,
     OriginalDocument,
 )
+from breadability.journal import Journal
 from .utils import load_snippet
 
 
@@ -35,6 +45,20 @@ def test_convert_hr_tags_to_paragraphs():
     assert returned == "<div>HI</p><p>How are you?</p><p>Fine\n I guess</div>"
 
 
+@pytest.mark.parametrize("html", [
+    "<div>HI<br><br>How are you?<br><br> \t \n  <br>Fine\n I guess</div>",
+    "<div>HI<br><br>How are you?<hr/> \t \n  <br>Fine\n I guess</div>",
+    "<div><p>a<br><br>b <b>c</b> d</p>tail</div>",
+    "<div>a<br>b<br>c</div>",
+    "<div>a<br><br><span>s</span> t<div>block</div>after</div>",
+])
+def test_convert_break_elements_like_breaks_in_string(html):
+    expected = build_document(convert_breaks_to_paragraphs(html))
+    returned = convert_break_elements_to_paragraphs(build_document(html))
+
+    assert tounicode(returned) == tounicode(expected)
+
+
 def test_readin_min_document():
     """Verify we can read in a min html document"""
     doc = OriginalDocument(load_snippet('document_min.html'))
@@ -111,3 +135,88 @@ def test_encoding_short():
 
     assert type(html) is unicode
     assert html == "ľščťžýáíé"
+
+
+def test_parsed_tree_input():
+    html = load_snippet('document_absolute_url.html')
+    tree = document_fromstring(html)
+    original = tounicode(tree)
+    doc = OriginalDocument(tree, url="http://blog.mitechie.com/test.html")
+
+    assert to_unicode(doc) == to_unicode(OriginalDocument(
+        html, url="http://blog.mitechie.com/test.html"))
+    assert tounicode(tree) == original
+
+
+def test_parsed_tree_mutated_in_place():
+    tree = document_fromstring("<div>a<br><br>b</div>")
+    doc = OriginalDocument(tree.getroottree(), mutate_input=True)
+
+    assert doc.dom is tree
+    assert tree.find(".//br") is None
+
+
+def test_tree_parsed_as_xml_not_supported():
+    doc = OriginalDocument(xml_fromstring("<html><body/></html>"))
+
+    with pytest.raises(TypeError):
+        doc.dom
+
+
+def test_mapped_file_input(tmpdir):
+    path = tmpdir.join("document.html")
+    path.write_binary(to_bytes(load_snippet('document_min.html')))
+
+    doc = OriginalDocument(map_file(str(path)))
+
+    assert doc.title == 'Min Document Title'
+
+
+def test_map_empty_file(tmpdir):
+    path = tmpdir.join("empty.html")
+    path.write_binary(b"")
+
+    assert map_file(str(path)) == b""
+
+
+def test_metadata():
+    doc = OriginalDocument(
+        load_snippet('document_metadata.html'), url="http://example.com/")
+    metadata = doc.metadata
+
+    assert metadata.title == "Metadata Title"
+    assert metadata.description == "Short description of the page."
+    assert metadata.canonical == "http://example.com/articles/metadata.html"
+    assert metadata.charset == "iso-8859-2"
+    assert metadata.og == {"og:title": "Open Graph Title", "og:type": "article"}
+
+
+def test_title_parses_only_head():
+    doc = OriginalDocument(load_snippet('document_min.html'))
+
+    assert doc.title == 'Min Document Title'
+    assert "_cached_property_dom" not in doc.__dict__
+
+
+def test_title_out_of_head():
+    doc = OriginalDocument(
+        "<html><head></head><body><title>Title</title></body></html>")
+
+    assert doc.metadata.title is None
+    assert doc.title == "Title"
+
+
+def test_metadata_of_parsed_tree_processed_by_journal():
+    tree = document_fromstring(load_snippet('document_metadata.html'))
+    doc = OriginalDocument(tree, url="http://example.com/", journal=Journal())
+
+    assert doc.metadata.canonical == "http://example.com/articles/metadata.html"
+    assert tree.find(".//link[@rel='canonical']").get("href") == "metadata.html"
+
+
+def test_cut_head():
+    assert cut_head("<html><head><title>t</title></HEAD ><body>") == (
+        "<html><head><title>t</title></HEAD >")
+    assert cut_head(b"<html><title>t</title><body class='x'>") == (
+        b"<html><title>t</title>")
+    assert cut_head("<html><title>t</title>") is None
@@ -0,0 +1,85 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import json
+import time
+
+from os.path import join
+
+from breadability.benchmarks.corpus import load_corpus
+from breadability.profiling import SamplingProfiler
+from breadability.readable import Article
+from .utils import load_snippet
+
+
+def _get_readable(html):
+    return Article(html).readable
+
+
+def test_every_nth_document_profiled():
+    profiler = SamplingProfiler(every=3)
+    html = load_snippet("h1_and_2_paragraphs.html")
+
+    for i in range(7):
+        result = profiler.call("doc%d" % i, html, _get_readable)
+        assert result == _get_readable(html)
+
+    assert profiler.documents == 7
+    assert profiler.profiled == 3
+    assert "_get_readable" in profiler.report()
+
+
+def test_slow_documents_profiled():
+    def process(html):
+        if html == "slow":
+            time.sleep(0.05)
+        return html
+
+    profiler = SamplingProfiler(threshold=0.03)
+    for html in ("fast", "slow", "fast"):
+        assert profiler.call(html, html, process) == html
+
+    assert profiler.profiled == 1
+    assert "sleep" in profiler.report()
+
+
+def test_nothing_profiled():
+    profiler = SamplingProfiler()
+    profiler.call("doc", "<p>text</p>", len)
+
+    assert profiler.profiled == 0
+    assert profiler.report() == "No document was profiled.\n"
+
+
+def test_slowest_documents_kept():
+    profiler = SamplingProfiler(keep_slowest=2)
+    for latency in (0.01, 0.03, 0.0, 0.02):
+        profiler.call("doc %s" % latency, latency, time.sleep)
+
+    names = [name for name, _ in profiler.slowest]
+    assert names == ["doc 0.03", "doc 0.02"]
+
+
+def test_slowest_documents_saved_as_corpus(tmpdir):
+    profiler = SamplingProfiler(every=1, keep_slowest=2)
+    html = load_snippet("h1_and_2_paragraphs.html")
+    profiler.call("http://example.com/a?b", html, _get_readable)
+    profiler.call("second", html.decode("utf8"), _get_readable)
+
+    directory = str(tmpdir.join("slowest"))
+    profiler.save_slowest(directory)
+    profiler.dump_stats(join(directory, "profile.stats"))
+
+    corpus = load_corpus(directory)
+    assert len(corpus) == 2
+    assert all(document == html for _, document in corpus)
+    with open(join(directory, "slowest.json")) as file:
+        index = json.load(file)
+    assert sorted(e["name"] for e in index) == [
+        "http://example.com/a?b", "second"]
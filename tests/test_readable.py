@@ -2,15 +2,18 @@
 
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from os.path import join
+
 import pytest
 from lxml.etree import tounicode
 from lxml.html import document_fromstring, fragment_fromstring
 
-from breadability._compat import to_unicode
+from breadability._compat import to_bytes, to_unicode
 from breadability.readable import (Article, get_class_weight, get_link_density, is_bad_link,
                                    leaf_div_elements_into_paragraphs, score_candidates, )
+from breadability.limits import Limits
 from breadability.scoring import ScoredNode
-from .utils import load_article, load_snippet
+from .utils import TEST_DIR, load_article, load_snippet
 
 # TestReadableDocument
 """Verify we can process html into a document to work off of."""
@@ -350,3 +353,287 @@ def test_simple_snippet():
             ("me :)", None),
         )
     ]
+
+
+# TestLiteMode
+
+def test_lite_mode_extracts_content():
+    article = Article(load_article("ars.001.html"), lite=True)
+
+    assert article.lite
+    assert 'id="readabilityBody"' in article.readable
+
+
+def test_lite_mode_drops_embedded_video():
+    html = (
+        "<html><body><div><p>%s</p>"
+        '<embed src="http://www.youtube.com/v/xyz"></embed>'
+        "</div></body></html>"
+    ) % ("This is a paragraph of text, long enough. " * 5)
+
+    assert "youtube" in Article(html).readable
+    assert "youtube" not in Article(html, lite=True).readable
+
+
+def test_lite_mode_used_when_limit_hit():
+    article = Article(load_article("ars.001.html"), limits=Limits(timeout=0))
+    assert not article.lite
+
+    assert 'id="readabilityBody"' in article.readable
+    assert article.lite
+
+
+# TestText
+
+def test_text_of_empty_document():
+    assert Article("").text == ""
+
+
+def test_text():
+    article = Article("<div><p>This is\r\ttext with <del>no</del> annotations</p></div>")
+
+    assert article.text == "This is\ntext with no annotations"
+
+
+def test_text_does_not_change_readable():
+    article = Article(load_snippet("annotated_1.html"))
+    readable = article.readable
+
+    assert "Paragraph is more better." in article.text
+    assert article.readable == readable
+
+
+def test_iter_main_text():
+    article = Article(load_snippet("annotated_1.html"))
+    paragraphs = article.iter_main_text()
+
+    assert next(paragraphs) == article.main_text[0]
+    assert list(paragraphs) == article.main_text[1:]
+
+
+# TestExtract
+
+def test_extract_all_outputs():
+    article = Article(load_snippet("document_min.html"))
+    outputs = article.extract()
+
+    assert sorted(outputs) == [
+        "annotated", "html_document", "html_fragment", "text", "title"]
+    assert outputs["html_fragment"].startswith('<div id="readabilityBody">')
+    assert outputs["html_document"].startswith("<!DOCTYPE html>\n<html>")
+    assert '<div id="readabilityBody">' in outputs["html_document"]
+    assert outputs["text"] == "Min Document"
+    assert outputs["annotated"] == [(("Min Document", ("h1",)),)]
+    assert outputs["title"] == "Min Document Title"
+
+
+def test_extract_selected_outputs():
+    article = Article(load_snippet("document_min.html"))
+
+    assert article.extract(("title",)) == {"title": "Min Document Title"}
+
+
+def test_extract_unknown_output():
+    article = Article(load_snippet("document_min.html"))
+
+    with pytest.raises(ValueError):
+        article.extract(("html_fragment", "pdf"))
+
+
+def test_fragment_and_document_from_one_extraction():
+    article = Article(load_article("ars.001.html"))
+    fragment = article.readable
+    document = article.readable_document
+
+    assert article.readable == fragment
+    assert fragment.strip() in document
+    assert document == Article(
+        load_article("ars.001.html"), return_fragment=False).readable_document
+
+
+def test_readable_document_of_empty_article():
+    article = Article("")
+
+    assert 'class="parsing-error"' in article.readable_document
+
+
+# TestRendering
+
+def test_renders_are_cached_and_identical(monkeypatch):
+    article = Article(load_article("ars.001.html"))
+    calls = []
+    original_readable = Article._readable
+
+    def readable(self):
+        calls.append(self)
+        return original_readable(self)
+
+    monkeypatch.setattr(Article, "_readable", readable)
+    renders = [
+        to_unicode(article), to_unicode(article), article.readable,
+        to_bytes(article).decode("utf8"), article.readable,
+    ]
+
+    assert len(calls) == 1
+    assert all(render == renders[0] for render in renders)
+    assert 'id="readabilityBody"' in renders[0]
+
+
+# TestRelease
+
+def test_release_keeps_computed_outputs():
+    article = Article(load_article("ars.001.html"))
+    readable = article.readable
+    title = article.title
+    article.release()
+
+    assert article.readable == readable
+    assert article.title == title
+    assert not hasattr(article, "_cached_property_candidates")
+    assert not hasattr(article, "_cached_property_dom")
+
+
+def test_release_detaches_readable_dom():
+    article = Article(load_article("ars.001.html"))
+    text = article.text
+    original_root = article.readable_dom.getroottree().getroot()
+    article.release()
+
+    readable_dom = article.readable_dom
+    assert readable_dom.getparent() is None
+    assert readable_dom.getroottree().getroot() is not original_root
+    # outputs derived from the readable tree are still available
+    assert article.text == text
+    assert article.main_text
+    assert "readabilityBody" in article.readable_document
+
+
+def test_output_not_computed_before_release():
+    article = Article(load_article("ars.001.html"))
+    article.release()
+
+    with pytest.raises(RuntimeError):
+        article.readable
+    with pytest.raises(RuntimeError):
+        article.title
+
+
+def test_extract_and_release():
+    article = Article(load_snippet("document_min.html"))
+    outputs = article.extract(("title",), release=True)
+
+    assert outputs == {"title": "Min Document Title"}
+    assert article.title == "Min Document Title"
+    with pytest.raises(RuntimeError):
+        article.readable
+
+
+def test_parsed_tree_input_not_mutated():
+    html = load_article("ars.001.html")
+    tree = document_fromstring(html)
+    original = tounicode(tree)
+    article = Article(tree)
+
+    assert article.readable == Article(html).readable
+    assert tounicode(tree) == original
+
+
+def test_parsed_tree_input_mutated():
+    tree = document_fromstring(load_snippet("document_scripts.html"))
+    article = Article(tree, mutate_input=True)
+
+    assert article.readable_dom.getroottree().getroot() is tree
+    assert tree.findall(".//script") == []
+
+
+def test_parsed_tree_input_not_truncated():
+    tree = document_fromstring(load_snippet("document_min.html"))
+    article = Article(tree, limits=Limits(max_bytes=1))
+
+    assert article.readable
+    assert article.limit_exceeded is None
+
+
+def test_from_path(tmpdir):
+    html = load_article("ars.001.html")
+    path = tmpdir.join("article.html")
+    path.write_binary(to_bytes(html))
+
+    article = Article.from_path(str(path), url="http://example.com/")
+
+    assert article.readable == Article(html, url="http://example.com/").readable
+
+
+def test_from_path_truncated(tmpdir):
+    path = tmpdir.join("article.html")
+    path.write_binary(to_bytes(load_article("ars.001.html")))
+
+    article = Article.from_path(str(path), limits=Limits(max_bytes=1000))
+
+    assert article.limit_exceeded == "max_bytes"
+    assert article.readable
+
+
+def test_metadata():
+    article = Article(load_snippet("document_metadata.html"))
+
+    assert article.metadata.title == "Metadata Title"
+    assert article.title == "Metadata Title"
+
+
+def test_alternatives():
+    article = Article(load_article("ars.001.html"))
+    alternatives = article.alternatives(3)
+
+    assert len(alternatives) == 3
+    scores = [alternative.score for alternative in alternatives]
+    assert scores == sorted(scores, reverse=True)
+    assert alternatives[0].readable == article.readable
+
+
+def test_alternatives_cleaned_lazily():
+    alternative = Article(load_article("ars.001.html")).alternatives(1)[0]
+    assert "_cached_property_readable_dom" not in alternative.__dict__
+
+    assert 'id="readabilityBody"' in alternative.readable
+    assert alternative.text
+
+
+def test_alternatives_independent_of_readable():
+    html = load_article("ars.001.html")
+    before = [a.readable for a in Article(html).alternatives(4)]
+
+    article = Article(html)
+    article.readable
+    after = [a.readable for a in article.alternatives(4)]
+
+    assert before == after
+
+
+def test_alternatives_of_winner_cleaned_out():
+    path = join(TEST_DIR, "test_articles", "test_antipope_org", "article.html")
+    with open(path, "rb") as file:
+        article = Article(file.read())
+
+    alternative, = article.alternatives(1)
+
+    assert "parsing-error" in alternative.readable
+    assert "parsing-error" not in article.readable
+    assert "The smart, fashionable startup-people" in article.readable
+
+
+def test_alternatives_of_given_tree():
+    html = load_article("ars.001.html")
+    tree = document_fromstring(html)
+    original = tounicode(tree)
+
+    article = Article(tree)
+    article.readable
+    alternatives = [a.readable for a in article.alternatives(2)]
+
+    assert alternatives == [a.readable for a in Article(html).alternatives(2)]
+    assert tounicode(tree) == original
+
+
+def test_alternatives_of_empty_document():
+    assert Article("").alternatives() == []
@@ -0,0 +1,102 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import pytest
+
+from lxml.html import document_fromstring
+
+from breadability.readable import Article
+from breadability.timing import NO_TIMER, StageTimer
+from .utils import load_article
+
+
+def test_stage_timer_sums_repeated_stages():
+    calls = []
+    timer = StageTimer(lambda *args: calls.append(args))
+
+    with timer.measure("stage"):
+        pass
+    timer.record("stage", 1.0, 0.5)
+    timer.record("other", 2.0, 1.5)
+
+    wall, cpu = timer.timings["stage"]
+    assert 1.0 <= wall < 2.0
+    assert 0.5 <= cpu < 1.5
+    assert timer.timings["other"] == (2.0, 1.5)
+    assert [c[0] for c in calls] == ["stage", "stage", "other"]
+
+
+def test_stage_timer_measures_failed_stage():
+    timer = StageTimer()
+
+    with pytest.raises(ValueError):
+        with timer.measure("failed"):
+            raise ValueError()
+
+    assert "failed" in timer.timings
+
+
+def test_no_timer_records_nothing():
+    with NO_TIMER.measure("stage"):
+        pass
+    NO_TIMER.record("stage", 1.0, 1.0)
+
+    assert NO_TIMER.timings == {}
+
+
+def test_article_not_measured_by_default():
+    article = Article(load_article("ars.001.html"))
+    article.readable
+
+    assert article.timings is None
+
+
+def test_article_timings():
+    article = Article(load_article("ars.001.html"), timings=True)
+    assert article.timings == {}
+
+    article.readable
+    timings = article.timings
+
+    for stage in ("decode_html", "convert_breaks_to_paragraphs",
+                  "build_document", "html_cleaner",
+                  "leaf_div_elements_into_paragraphs", "find_candidates",
+                  "score_candidates", "check_siblings", "prep_article",
+                  "remove_orphans", "serialize"):
+        wall, cpu = timings[stage]
+        assert wall >= 0 and cpu >= 0
+    assert timings["find_candidates"][0] >= timings["score_candidates"][0]
+    assert "annotate" not in timings
+
+    article.main_text
+    assert "annotate" in article.timings
+
+
+def test_article_timings_of_tree():
+    tree = document_fromstring(load_article("ars.001.html"))
+    article = Article(tree, timings=True)
+    article.text
+
+    timings = article.timings
+    assert "convert_break_elements_to_paragraphs" in timings
+    assert "preclean_document" in timings
+    assert "extract_text" in timings
+    assert "decode_html" not in timings
+
+
+def test_article_stage_callback():
+    calls = []
+    article = Article(load_article("ars.001.html"),
+                      on_stage=lambda *args: calls.append(args))
+    article.readable
+
+    stages = [stage for stage, _, _ in calls]
+    assert stages[0] == "decode_html"
+    assert stages[-1] == "serialize"
+    assert set(stages) == set(article.timings)
@@ -0,0 +1,112 @@
+# -*- coding: utf8 -*-
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals
+)
+
+import json
+import logging
+
+from lxml.html import fragment_fromstring
+
+from breadability.readable import Article, check_siblings
+from breadability.scoring import ScoredNode
+from breadability.trace import Trace, describe_node, trace_event, tracing
+from .utils import load_article, load_snippet
+
+
+def test_describe_node():
+    node = fragment_fromstring('<div id="main" class="a  b">text</div>')
+
+    assert describe_node(node) == "div#main.a.b"
+    assert describe_node(fragment_fromstring("<p>text</p>")) == "p"
+
+
+def test_events_recorded_only_in_context():
+    node = fragment_fromstring("<p>text</p>")
+    trace = Trace()
+
+    trace_event("drop", node, reason="outside")
+    with tracing(trace):
+        trace_event("drop", node, reason="unlikely")
+        with tracing(None):
+            trace_event("winner", node, score=1.5)
+    trace_event("drop", node, reason="outside")
+
+    assert trace.events == [
+        {"event": "drop", "node": "p", "reason": "unlikely"},
+        {"event": "winner", "node": "p", "score": 1.5},
+    ]
+    assert trace.format() == "drop p reason=unlikely\nwinner p score=1.500"
+
+
+def test_sibling_decisions_traced():
+    html = (
+        '<div><div class="main"><p>%s</p></div>'
+        '<p>Short one. Without links.</p>'
+        '<p><a href="/">short link</a></p></div>' % ("text, " * 30)
+    )
+    node = fragment_fromstring(html)
+    candidate = ScoredNode(node[0])
+    candidate.content_score = 100
+    trace = Trace()
+
+    with tracing(trace):
+        check_siblings(candidate, {node[0]: candidate})
+
+    decisions = [(e["node"], e["appended"], e["reason"]) for e in trace.events]
+    assert decisions == [
+        ("div.main", True, "candidate"),
+        ("p", True, "short_paragraph"),
+        ("p", False, None),
+    ]
+
+
+def test_article_not_traced_by_default():
+    article = Article(load_article("ars.001.html"))
+    article.readable
+
+    assert article.trace is None
+
+
+def test_article_trace():
+    article = Article(load_article("ars.001.html"), trace=True)
+    article.readable
+    events = article.trace.events
+
+    kinds = set(event["event"] for event in events)
+    assert set(["candidate", "drop", "winner", "sibling"]) <= kinds
+
+    scores = [e["score"] for e in events if e["event"] == "candidate"]
+    assert scores == sorted(scores, reverse=True)
+    winner, = [e for e in events if e["event"] == "winner"]
+    assert winner["score"] == scores[0]
+    assert all(e["reason"] for e in events if e["event"] == "drop")
+    # events are serializable
+    json.dumps(events)
+
+
+def test_article_trace_of_fallback():
+    article = Article(load_snippet("document_min.html"), trace=True)
+    article.readable
+
+    events = article.trace.events
+    assert {"event": "fallback", "reason": "no_candidates"} in events
+    assert "winner" not in set(event["event"] for event in events)
+
+
+def test_expensive_debug_messages_skipped_when_disabled(monkeypatch):
+    messages = []
+    logger = logging.getLogger("breadability")
+    monkeypatch.setattr(logger, "isEnabledFor", lambda level: False)
+    monkeypatch.setattr(
+        logger, "debug", lambda message, *args: messages.append(message))
+
+    Article(load_article("ars.001.html")).readable
+
+    # attributes and text of nodes are formatted only for debugging
+    assert messages
+    assert not [m for m in messages if "%r" in m]